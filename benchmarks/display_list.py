@@ -0,0 +1,78 @@
+"""
+Benchmark for drawing a frame of many canvas items (10 000 by default)
+through rendering.TclDisplayList, compared with one tkinter call per
+item.
+
+With a display, the items are drawn on a real Tk canvas. Without one,
+the canvas is a Tcl command which does nothing, so only the cost of
+getting the calls from Python into Tcl is measured.
+
+    python benchmarks/display_list.py [items] [frames]
+"""
+import sys
+import time
+import tkinter
+
+from uib_inf100_graphics.rendering import TclDisplayList
+
+
+class _NullCanvas(tkinter.Canvas):
+    # A tkinter Canvas whose Tcl command accepts and ignores everything
+    def __init__(self, interpreter: tkinter.Tk):
+        interpreter.eval('proc ::null_canvas {args} {return 1}')
+        self.tk = interpreter.tk
+        self._w = '::null_canvas'
+        self._tclCommands = None
+
+
+def _frame_calls(items: int) -> list[tuple[tuple[float, ...], dict[str, object]]]:
+    calls = []
+    for i in range(items):
+        x, y = 5 * (i % 100), 5 * (i // 100)
+        calls.append(((x, y, x + 4, y + 4),
+                      {'fill': 'red' if i % 2 else 'blue', 'outline': 'black', 'width': 1}))
+    return calls
+
+
+def _time_per_frame(draw_frame, frames: int) -> float:
+    draw_frame() # warm up
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw_frame()
+    return (time.perf_counter() - start) / frames
+
+
+def main(items: int=10_000, frames: int=10) -> None:
+    try:
+        root = tkinter.Tk()
+        canvas = tkinter.Canvas(root, width=500, height=500)
+        canvas.pack()
+        kind = 'Tk canvas'
+    except tkinter.TclError:
+        root = tkinter.Tcl()
+        canvas = _NullCanvas(root)
+        kind = 'no-op Tcl canvas (no display)'
+    calls = _frame_calls(items)
+    display_list = TclDisplayList(canvas)
+
+    def direct() -> None:
+        canvas.delete('all')
+        for args, kwargs in calls:
+            canvas.create_rectangle(*args, **kwargs)
+
+    def batched() -> None:
+        display_list.delete('all')
+        for args, kwargs in calls:
+            display_list.create('create_rectangle', args, kwargs)
+        display_list.flush()
+
+    print(f'{items} create_rectangle calls per frame on a {kind}:')
+    direct_seconds = _time_per_frame(direct, frames)
+    batched_seconds = _time_per_frame(batched, frames)
+    print(f'  one tkinter call per item: {1000 * direct_seconds:7.1f} ms per frame')
+    print(f'  TclDisplayList:            {1000 * batched_seconds:7.1f} ms per frame'
+          + f' ({direct_seconds / batched_seconds:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
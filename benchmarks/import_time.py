@@ -0,0 +1,71 @@
+"""
+Benchmark for the cold import time of the package: each module is
+imported in a fresh interpreter with -X importtime, and the best of a
+number of runs (5 by default) is reported, together with the slowest
+modules imported along with it and which heavy optional dependencies
+were imported (these should only be imported when first used).
+
+    python benchmarks/import_time.py [runs] [modules...]
+"""
+import os
+import subprocess
+import sys
+
+import uib_inf100_graphics
+
+_MODULES = ['uib_inf100_graphics', 'uib_inf100_graphics.simple',
+            'uib_inf100_graphics.event_app', 'uib_inf100_graphics.helpers']
+_HEAVY = ['PIL.Image', 'PIL.ImageTk', 'PIL.ImageDraw', 'PIL.ImageFont',
+          'requests', 'pyscreenshot', 'concurrent.futures']
+
+
+def _import_once(module: str) -> tuple[int, dict[str, int], list[str]]:
+    """
+    Imports module in a fresh interpreter, and returns the time in
+    microseconds spent importing the package, the cumulative import
+    time of every module imported by it, and the heavy modules imported.
+    """
+    code = ('import sys, ' + module + '; '
+            + f'print(*[m for m in {_HEAVY!r} if m in sys.modules])')
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None) # Cold, but not compiling
+    src = os.path.dirname(os.path.dirname(uib_inf100_graphics.__file__))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [src, env.get('PYTHONPATH')]))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env, check=True)
+    total = 0
+    cumulative_times: dict[str, int] = {}
+    nested: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        nested[name.strip()] = int(cumulative)
+        if name.startswith('  '):
+            continue
+        # A top level import is printed after the imports nested in it,
+        # and its cumulative time includes theirs
+        if name.startswith(' uib_inf100_graphics'):
+            total += int(cumulative)
+            cumulative_times.update(nested)
+        nested = {}
+    return total, cumulative_times, result.stdout.split()
+
+
+def main(runs: int=5, modules: list[str]|None=None) -> None:
+    _import_once('uib_inf100_graphics') # writes the bytecode
+    for module in modules or _MODULES:
+        total, cumulative_times, heavy = min(
+            (_import_once(module) for _ in range(runs)), key=lambda r: r[0])
+        print(f'import {module}: {total / 1000:6.1f} ms (best of {runs})')
+        slowest = sorted(((t, name) for name, t in cumulative_times.items()
+                          if not name.startswith('uib_inf100_graphics')),
+                         reverse=True)[:5]
+        for t, name in slowest:
+            print(f'    {t / 1000:6.1f} ms  {name}')
+        print(f'  heavy modules imported: {", ".join(heavy) or "none"}')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]], sys.argv[2:])
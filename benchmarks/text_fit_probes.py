@@ -0,0 +1,66 @@
+"""
+Benchmark for the number of measurements (probes) text_in_box makes to
+find the largest font size which fits, with the estimate from a
+reference size compared with the plain binary search it falls back to.
+
+The measure functions stand in for the width or height of text at a
+font size, so no display is needed: linespace and width grow nearly
+proportionally with the size, while offset and steps are less like
+text, and need the fallback more often. Each is solved for the given
+number of random box sizes (3000 between 10 and 600 pixels by default).
+
+    python benchmarks/text_fit_probes.py [calls] [smallest] [largest]
+"""
+import math
+import random
+import sys
+import time
+from typing import Callable
+
+from uib_inf100_graphics.helpers.text import (
+    _binary_search_maximize_int_outcome_below,
+    _estimate_maximize_int_outcome_below,
+)
+
+_MEASURES: dict[str, Callable[[int], float]] = {
+    'linespace': lambda size: math.ceil(1.17 * size) + 1,
+    'width': lambda size: sum(math.floor(advance * size + 0.5)
+                              for advance in (0.6, 0.6, 0.3, 0.7, 0.6, 0.6, 0.3)),
+    'offset': lambda size: 3 * size + 40,
+    'steps': lambda size: 10 * (size // 3) + 5,
+}
+
+
+def _count_probes(search, measure: Callable[[int], float],
+                  problems: list[tuple[float, int]]) -> tuple[list[int], int, float]:
+    # Returns the sizes found, the number of probes and the time taken
+    probes = 0
+    def counted(size: int) -> float:
+        nonlocal probes
+        probes += 1
+        return measure(size)
+    start = time.perf_counter()
+    sizes = [search(threshold, counted, min_value) for threshold, min_value in problems]
+    return sizes, probes, time.perf_counter() - start
+
+
+def main(calls: int=3000, smallest: float=10, largest: float=600) -> None:
+    random.seed(2)
+    problems = [(random.uniform(smallest, largest), random.choice([1, 1, 1, 5, 12]))
+                for _ in range(calls)]
+    print(f'{calls} sizes fitted between {smallest:g} and {largest:g} pixels:')
+    print(f'  {"measure":10s} {"binary search":>22s} {"estimate":>22s} {"differ":>7s}')
+    for name, measure in _MEASURES.items():
+        expected, searched, search_seconds = _count_probes(
+                _binary_search_maximize_int_outcome_below, measure, problems)
+        sizes, estimated, estimate_seconds = _count_probes(
+                _estimate_maximize_int_outcome_below, measure, problems)
+        differ = sum(a != b for a, b in zip(expected, sizes))
+        print(f'  {name:10s}'
+              + f' {searched / calls:5.1f} probes {1e6 * search_seconds / calls:5.1f} us'
+              + f' {estimated / calls:5.1f} probes {1e6 * estimate_seconds / calls:5.1f} us'
+              + f' {differ:7d}')
+
+
+if __name__ == '__main__':
+    main(*[float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:4])])
@@ -1,2 +1,10 @@
 from .version import __version__, __last_updated__
-from .event_app import run_app
+
+
+def __getattr__(name):
+    # run_app is imported on first use, so that importing a subpackage
+    # (such as uib_inf100_graphics.simple) does not load event_app
+    if name == 'run_app':
+        from .event_app import run_app
+        return run_app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,3 +1,4 @@
+import functools
 from tkinter import Canvas
 
 class AppBase:
@@ -5,8 +6,66 @@ class AppBase:
     height: int
 
 class MouseEvent:
-    x: int
-    y: int
+    # Built directly from Tk's %x %y substitutions
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    def __repr__(self):
+        return f'Event(x={self.x}, y={self.y})'
 
 class KeyEvent:
-    key: str
\ No newline at end of file
+    # Built directly from Tk's %K %A %s substitutions
+    __slots__ = ('key', 'ctrl', 'alt', 'shift')
+
+    def __init__(self, key: str, ctrl: bool=False, alt: bool=False, shift: bool=False):
+        self.key = key
+        self.ctrl = ctrl
+        self.alt = alt
+        self.shift = shift
+
+    @staticmethod
+    def _from_tk(keysym: str, char: str, state: str|int) -> 'KeyEvent':
+        return KeyEvent(*_key_info(keysym, char, int(state)))
+
+    def __repr__(self):
+        return f'Event(key={repr(self.key)})'
+
+    @staticmethod
+    def _use_event_key(attr):
+        raise Exception(f'Use event.key instead of event.{attr}')
+
+    keysym = property(lambda *args: KeyEvent._use_event_key('keysym'),
+                      lambda *args: KeyEvent._use_event_key('keysym'))
+    char =   property(lambda *args: KeyEvent._use_event_key('char'),
+                      lambda *args: KeyEvent._use_event_key('char'))
+
+_keyNameMap = { '\t':'Tab', '\n':'Enter', '\r':'Enter', '\b':'Backspace',
+                chr(127):'Delete', chr(27):'Escape', ' ':'Space' }
+
+@functools.lru_cache(maxsize=1024)
+def _key_info(keysym: str, char: str, state: int) -> tuple[str, bool, bool, bool]:
+    # Returns (key, ctrl, alt, shift); there are few distinct combinations,
+    # so they are only worked out once
+    key = c = char
+    has_control_key = (state & 0x4 != 0)
+    if ((c in [None, '']) or (len(c) > 1) or (ord(c) > 255)):
+        key = keysym
+        if (key.endswith('_L') or
+            key.endswith('_R') or
+            key.endswith('_Lock')):
+            key = 'Modifier_Key'
+    elif (c in _keyNameMap):
+        key = _keyNameMap[c]
+    elif ((len(c) == 1) and (1 <= ord(c) <= 26)):
+        key = chr(ord('a')-1 + ord(c))
+        has_control_key = True
+    if has_control_key and (len(key) == 1):
+        # don't add control- prefix to Enter, Tab, Escape, ...
+        key = 'control-' + key
+    ctrl  = (state & 0x4) != 0
+    alt   = (state & 0x8) != 0 or (state & 0x80) != 0
+    shift = (state & 0x1) != 0
+    return key, ctrl, alt, shift
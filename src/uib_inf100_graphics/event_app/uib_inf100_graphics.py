@@ -14,8 +14,8 @@ LAST_UPDATED  = __last_updated__
 
 from typing import Any
 from tkinter import *
-from tkinter import messagebox, simpledialog, filedialog
-import inspect, copy, traceback
+from tkinter import messagebox, simpledialog, filedialog, _flatten
+import inspect, copy, traceback, time, functools, importlib, types
 import sys, os
 from io import BytesIO
 
@@ -27,59 +27,244 @@ def failed_import(importName, installName=None):
     print('**********************************************************')
     print()
 
-try: from PIL import Image, ImageTk, ImageDraw, ImageFont
-except ModuleNotFoundError: failed_import('PIL', 'pillow')
-
-if sys.platform.startswith('linux'):
-    try: import pyscreenshot as ImageGrabber
-    except ModuleNotFoundError: failed_import('pyscreenshot')
-else:
-    try: from PIL import ImageGrab as ImageGrabber
-    except ModuleNotFoundError: pass # Our PIL warning is already printed above
-
-try: import requests
-except ModuleNotFoundError: failed_import('requests')
-
-def get_hash(obj):
-    # This is used to detect MVC violations in redraw_all
-    # @TODO: Make this more robust and efficient
-    try:
-        return get_hash(obj.__dict__)
-    except:
-        if (isinstance(obj, list)): return get_hash(tuple([get_hash(v) for v in obj]))
-        elif (isinstance(obj, set)): return get_hash(sorted(obj))
-        elif (isinstance(obj, dict)): return get_hash(tuple([obj[key] for key in sorted(obj)]))
-        else:
-            try: return hash(obj)
-            except: return get_hash(repr(obj))
-
-class WrappedCanvas(Canvas):
+# PIL, requests and pyscreenshot are slow to import and only needed by a few
+# methods (load_image, get_snapshot, create_image with pil_image=, ...), so
+# they are imported when those are first used
+def lazy_import(importName, installName=None):
+    try: return importlib.import_module(importName)
+    except ModuleNotFoundError:
+        failed_import(importName.split('.')[0], installName)
+        raise
+
+def _is_pil_image(obj):
+    # If PIL has not been imported, obj cannot be a PIL image
+    Image = sys.modules.get('PIL.Image', None)
+    return (Image is not None) and isinstance(obj, Image.Image)
+
+def _image_grabber():
+    if sys.platform.startswith('linux'): return lazy_import('pyscreenshot')
+    return lazy_import('PIL.ImageGrab', 'pillow')
+
+from uib_inf100_graphics.rendering import TclDisplayList, get_backend
+from uib_inf100_graphics.event_app.types import KeyEvent, MouseEvent
+
+_ATOMIC_TYPES = frozenset({int, float, complex, str, bytes, bool, type(None)})
+_NAMESPACE_TYPES = frozenset({type, types.FunctionType, types.BuiltinFunctionType, types.ModuleType})
+_INEXACT, _EXACT, _IMMUTABLE = 0, 1, 2 # kinds of snapshots, see _snapshot
+
+def _snapshot(obj, _active=None):
+    # This is used to detect changes to the model, such as MVC violations in
+    # redraw_all. Returns (snapshot, kind): the snapshot is a copy of obj made
+    # of tuples, frozensets and atomic values, which is equal (==) to the
+    # snapshot of another object when the two have the same content. Unlike
+    # hashes (hash(-1) == hash(-2)), different snapshots are never equal, as
+    # long as kind is not _INEXACT: objects we cannot look inside (such as PIL
+    # images, or instances of classes written in C) are only compared by
+    # identity or repr. Snapshots of kind _IMMUTABLE stay valid for as long as
+    # obj exists, since obj cannot change
+    t = type(obj)
+    if (t in _ATOMIC_TYPES): return (t, obj), _IMMUTABLE
+    if ((t is list) or (t is tuple)):
+        # Containers of atomic values (the common case) are copied with one
+        # C-level call instead of recursing into each element
+        item_types = tuple(map(type, obj))
+        if (set(item_types) <= _ATOMIC_TYPES):
+            if (t is tuple): return (t, item_types, obj), _IMMUTABLE
+            return (t, item_types, tuple(obj)), _EXACT
+        parts = [_snapshot(v, _active) for v in obj]
+        kind = min([part_kind for _, part_kind in parts])
+        return (t, tuple([part for part, _ in parts])), (kind if (t is tuple) else min(kind, _EXACT))
+    if ((t is set) or (t is frozenset)):
+        if (set(map(type, obj)) <= _ATOMIC_TYPES):
+            # (with the types, as {1} == {True})
+            return (t, frozenset(zip(map(type, obj), obj))), (_IMMUTABLE if (t is frozenset) else _EXACT)
+        parts = [_snapshot(v, _active) for v in obj]
+        kind = min([part_kind for _, part_kind in parts])
+        return (t, frozenset([part for part, _ in parts])), (kind if (t is frozenset) else min(kind, _EXACT))
+    if (t is dict):
+        values, kind = _snapshot(list(obj.values()), _active)
+        return (t, tuple(zip(map(type, obj), obj)), values), min(kind, _EXACT)
+    if (t is range): return obj, _IMMUTABLE
+    if (t in _NAMESPACE_TYPES):
+        # Classes, modules and functions are namespaces which can be changed,
+        # but we do not look inside them (a module may lead to everything);
+        # the repr of their namespace lets the MVC check notice changes
+        return (t, id(obj), repr(getattr(obj, '__dict__', None))), _INEXACT
+    d = getattr(obj, '__dict__', None)
+    if (isinstance(d, dict)):
+        _active = _active if (_active is not None) else set()
+        if (id(obj) in _active): return (t, id(obj)), _EXACT # a reference cycle
+        _active.add(id(obj))
+        try: snapshot, kind = _snapshot(d, _active)
+        finally: _active.discard(id(obj))
+        # Instances of subclasses of list, dict etc. (or with __slots__) keep
+        # some of their content outside of __dict__
+        return (t, snapshot), (min(kind, _EXACT) if _is_plain_class(t) else _INEXACT)
+    try: hash(obj); return obj, _INEXACT
+    except TypeError: return repr(obj), _INEXACT
+
+@functools.cache
+def _is_plain_class(t):
+    # True if t is defined in Python, on top of object, without __slots__
+    return all(((c.__flags__ & _HEAP_TYPE_FLAG) and ('__slots__' not in vars(c)))
+               for c in t.__mro__[:-1])
+
+_HEAP_TYPE_FLAG = 1 << 9 # set in __flags__ of classes defined in Python
+
+def _normalize_draw_call(args, kwargs):
+    # Turns the arguments of a create_* call into a snapshot (coords, options)
+    # which can be compared with the snapshot of the same call in the last frame
+    args = _flatten(args)
+    options = { }
+    if (args and isinstance(args[-1], dict)):
+        options.update(args[-1])
+        args = args[:-1]
+    options.update(kwargs)
+    for key in options:
+        if (isinstance(options[key], list)): options[key] = tuple(options[key])
+    return args, options
+
+def _copied(value):
+    # Copies the lists, tuples and dicts in value all the way down; other
+    # objects (such as images and fonts) are not copied
+    if (type(value) is list): return [_copied(item) for item in value]
+    if (type(value) is tuple): return tuple([_copied(item) for item in value])
+    if (type(value) is dict): return { key: _copied(item) for key, item in value.items() }
+    return value
+
+class _WrappedCanvasMixin:
     # Enforces MVC: no drawing outside calls to redraw_all
     # Logs draw calls (for autograder) in canvas.logged_drawing_calls
+    # Retained mode: items from the last frame are reused and only updated
+    # (with coords/itemconfigure) where the new frame differs from it
     def __init__(wrapped_canvas, app):
         wrapped_canvas.logged_drawing_calls = [ ]
         wrapped_canvas.log_drawing_calls = True
         wrapped_canvas.in_redraw_all = False
         wrapped_canvas.app = app
+        wrapped_canvas._retained_items = [ ] # (id, method_name, coords, options) from last frame
+        wrapped_canvas._frame_items = [ ]    # ditto for the frame currently being drawn
+        wrapped_canvas._in_frame = False
+        wrapped_canvas._retained_items_invalid = False
         super().__init__(app._root, width=app.width, height=app.height)
 
-    def log(self, method_name, args, kwargs):
+    def _verify_in_redraw_all(self):
         if (not self.in_redraw_all):
             self.app._mvc_violation('you may not use the canvas (the view) outside of redraw_all')
-        if (self.log_drawing_calls):
-            self.logged_drawing_calls.append((method_name, args, kwargs))
 
-    def create_arc(self, *args, **kwargs): self.log('create_arc', args, kwargs); return super().create_arc(*args, **kwargs)
-    def create_bitmap(self, *args, **kwargs): self.log('create_bitmap', args, kwargs); return super().create_bitmap(*args, **kwargs)
-    def create_line(self, *args, **kwargs): self.log('create_line', args, kwargs); return super().create_line(*args, **kwargs)
-    def create_oval(self, *args, **kwargs): self.log('create_oval', args, kwargs); return super().create_oval(*args, **kwargs)
-    def create_polygon(self, *args, **kwargs): self.log('create_polygon', args, kwargs); return super().create_polygon(*args, **kwargs)
-    def create_rectangle(self, *args, **kwargs): self.log('create_rectangle', args, kwargs); return super().create_rectangle(*args, **kwargs)
-    def create_text(self, *args, **kwargs): self.log('create_text', args, kwargs); return super().create_text(*args, **kwargs)
-    def create_window(self, *args, **kwargs): self.log('create_window', args, kwargs); return super().create_window(*args, **kwargs)
+    def log(self, method_name, args, kwargs):
+        self._verify_in_redraw_all()
+        if (self.log_drawing_calls):
+            # Copied, so that the logged calls (and snapshots drawn from them)
+            # do not change when the app changes the lists it drew from
+            self.logged_drawing_calls.append((method_name, _copied(args), _copied(kwargs)))
+
+    def _begin_frame(self):
+        if (self._retained_items_invalid):
+            self._item_delete(ALL)
+            self._retained_items = [ ]
+            self._retained_items_invalid = False
+        self._frame_items = [ ]
+        self._in_frame = True
+
+    def _end_frame(self):
+        if (not self._in_frame): return
+        self._in_frame = False
+        stale_ids = [item[0] for item in self._retained_items[len(self._frame_items):]]
+        if stale_ids: self._item_delete(*stale_ids)
+        self._retained_items = self._frame_items
+        self._frame_items = [ ]
+        self._flush_items()
+
+    def _invalidate_retained_items(self):
+        # Items were changed behind our back, so we can no longer trust that the
+        # items from the last frame look like we remember; rebuild next frame
+        self._retained_items_invalid = True
+        if (self._in_frame):
+            stale_ids = [item[0] for item in self._retained_items[len(self._frame_items):]]
+            if stale_ids: self._item_delete(*stale_ids)
+            self._retained_items = self._retained_items[:len(self._frame_items)]
+        self._flush_items() # the caller is about to use the canvas directly
+
+    def _draw(self, method_name, args, kwargs):
+        if (not self._in_frame):
+            item_id = self._item_create(method_name, args, kwargs)
+            self._flush_items()
+            return item_id
+        coords, options = _normalize_draw_call(args, kwargs)
+        index = len(self._frame_items)
+        old = self._retained_items[index] if (index < len(self._retained_items)) else None
+        if ((old is not None) and (old[1] == method_name) and (old[3].keys() == options.keys())):
+            item_id, old_coords, old_options = old[0], old[2], old[3]
+            if (old_coords != coords): self._item_coords(item_id, coords, (method_name, args, kwargs))
+            changed = { key: options[key] for key in options if (old_options[key] != options[key]) }
+            if changed: self._item_configure(item_id, changed, (method_name, args, kwargs))
+        else:
+            item_id = self._item_create(method_name, coords, options)
+            if (old is not None):
+                # replace the old item, keeping the stacking order
+                self._item_delete(old[0])
+                if (index == 0): self._item_lower(item_id)
+                else: self._item_raise(item_id, self._frame_items[-1][0])
+        self._frame_items.append((item_id, method_name, coords, options))
+        return item_id
+
+    # Item operations used by _draw and the frame methods above. They take
+    # effect right away here, while WrappedCanvas batches them until the
+    # next call to _flush_items
+    def _item_create(self, method_name, coords, options): return getattr(super(), method_name)(*coords, **options)
+    def _item_coords(self, item_id, coords, source): super().coords(item_id, *coords)
+    def _item_configure(self, item_id, options, source): super().itemconfigure(item_id, **options)
+    def _item_delete(self, *item_ids): super().delete(*item_ids)
+    def _item_raise(self, item_id, above_id): super().tag_raise(item_id, above_id)
+    def _item_lower(self, item_id): super().tag_lower(item_id)
+    def _flush_items(self): pass
+
+    def create_arc(self, *args, **kwargs): self.log('create_arc', args, kwargs); return self._draw('create_arc', args, kwargs)
+    def create_bitmap(self, *args, **kwargs): self.log('create_bitmap', args, kwargs); return self._draw('create_bitmap', args, kwargs)
+    def create_line(self, *args, **kwargs): self.log('create_line', args, kwargs); return self._draw('create_line', args, kwargs)
+    def create_oval(self, *args, **kwargs): self.log('create_oval', args, kwargs); return self._draw('create_oval', args, kwargs)
+    def create_polygon(self, *args, **kwargs): self.log('create_polygon', args, kwargs); return self._draw('create_polygon', args, kwargs)
+    def create_rectangle(self, *args, **kwargs): self.log('create_rectangle', args, kwargs); return self._draw('create_rectangle', args, kwargs)
+    def create_text(self, *args, **kwargs): self.log('create_text', args, kwargs); return self._draw('create_text', args, kwargs)
+    def create_window(self, *args, **kwargs): self.log('create_window', args, kwargs); return self._draw('create_window', args, kwargs)
+
+    # Methods which change existing items invalidate the retained items
+    def coords(self, *args):
+        if (len(args) > 1): self._invalidate_retained_items()
+        else: self._flush_items()
+        return super().coords(*args)
+    def itemconfigure(self, tagOrId, cnf=None, **kw):
+        if (cnf or kw): self._invalidate_retained_items()
+        else: self._flush_items()
+        return super().itemconfigure(tagOrId, cnf, **kw)
+    itemconfig = itemconfigure
+    def delete(self, *args): self._invalidate_retained_items(); return super().delete(*args)
+    def move(self, *args): self._invalidate_retained_items(); return super().move(*args)
+    def moveto(self, *args, **kwargs): self._invalidate_retained_items(); return super().moveto(*args, **kwargs)
+    def scale(self, *args): self._invalidate_retained_items(); return super().scale(*args)
+    def insert(self, *args): self._invalidate_retained_items(); return super().insert(*args)
+    def dchars(self, *args): self._invalidate_retained_items(); return super().dchars(*args)
+    def tag_raise(self, *args): self._invalidate_retained_items(); return super().tag_raise(*args)
+    def tag_lower(self, *args): self._invalidate_retained_items(); return super().tag_lower(*args)
+    lift = tkraise = tag_raise
+    lower = tag_lower
+
+    # Methods which look at existing items must see all items drawn so far
+    def bbox(self, *args): self._flush_items(); return super().bbox(*args)
+    def find_all(self): self._flush_items(); return super().find_all()
+    def find_above(self, *args): self._flush_items(); return super().find_above(*args)
+    def find_below(self, *args): self._flush_items(); return super().find_below(*args)
+    def find_closest(self, *args): self._flush_items(); return super().find_closest(*args)
+    def find_enclosed(self, *args): self._flush_items(); return super().find_enclosed(*args)
+    def find_overlapping(self, *args): self._flush_items(); return super().find_overlapping(*args)
+    def find_withtag(self, *args): self._flush_items(); return super().find_withtag(*args)
+    def gettags(self, *args): self._flush_items(); return super().gettags(*args)
+    def itemcget(self, *args): self._flush_items(); return super().itemcget(*args)
+    def type(self, *args): self._flush_items(); return super().type(*args)
 
     def create_image(self, *args, **kwargs):
-        self.log('create_image', args, kwargs);
+        self._verify_in_redraw_all()
         uses_image = 'image' in kwargs
         uses_pil_image = 'pil_image' in kwargs
         if ((not uses_image) and (not uses_pil_image)):
@@ -89,17 +274,86 @@ class WrappedCanvas(Canvas):
         elif (uses_pil_image):
             pil_image = kwargs['pil_image']
             del kwargs['pil_image']
-            if (not isinstance(pil_image, Image.Image)):
+            if (not _is_pil_image(pil_image)):
                 raise Exception('create_image: pil_image value is not an instance of a PIL/Pillow image')
-            image = ImageTk.PhotoImage(pil_image)
+            image = self._image_from_pil_image(pil_image)
         else:
             image = kwargs['image']
-            if (isinstance(image, Image.Image)):
+            if (_is_pil_image(image)):
                 raise Exception('create_image: image must not be an instance of a PIL/Pillow image\n' +
                     'You perhaps meant to convert from PIL to Tkinter, like so:\n' +
                     '     canvas.create_image(x, y, image=ImageTk.PhotoImage(image))')
         kwargs['image'] = image
-        return super().create_image(*args, **kwargs)
+        # Logged as drawn, with the image (and not the pil_image) it shows
+        self.log('create_image', args, kwargs)
+        return self._draw('create_image', args, kwargs)
+
+class WrappedCanvas(_WrappedCanvasMixin, Canvas):
+    # Draws in a Tk window
+    # The item operations of a frame are collected in a display list and run
+    # with a single call into Tcl when the frame ends (or when the canvas is
+    # used directly). Tk numbers the items of a canvas 1, 2, 3, ..., so the
+    # ids of new items are known before they are actually created
+    def __init__(wrapped_canvas, app):
+        super().__init__(app)
+        wrapped_canvas._display_list = TclDisplayList(wrapped_canvas)
+        wrapped_canvas._next_item_id = 1
+        # Tk deletes a PhotoImage (blanking the items showing it) when Python
+        # drops it, so the canvas holds on to the images of the frame on the
+        # screen and of the frame being drawn, whatever the cache evicts
+        wrapped_canvas._shown_photoimages = [ ]
+        wrapped_canvas._frame_photoimages = [ ]
+
+    def _image_from_pil_image(self, pil_image):
+        from uib_inf100_graphics.rendering import photoimage_cache
+        photoimage = photoimage_cache.get(pil_image)
+        self._frame_photoimages.append(photoimage)
+        return photoimage
+
+    def _end_frame(self):
+        if (not self._in_frame): return
+        super()._end_frame()
+        # The new frame is on the screen now, so the last one's images may go
+        self._shown_photoimages = self._frame_photoimages
+        self._frame_photoimages = [ ]
+
+    def _item_create(self, method_name, coords, options):
+        self._display_list.create(method_name, coords, options)
+        item_id = self._next_item_id
+        self._next_item_id += 1
+        return item_id
+    def _item_coords(self, item_id, coords, source): self._display_list.coords(item_id, coords, source)
+    def _item_configure(self, item_id, options, source): self._display_list.itemconfigure(item_id, options, source)
+    def _item_delete(self, *item_ids): self._display_list.delete(*item_ids)
+    def _item_raise(self, item_id, above_id): self._display_list.tag_raise(item_id, above_id)
+    def _item_lower(self, item_id): self._display_list.tag_lower(item_id)
+
+    def _flush_items(self):
+        try:
+            last_id = self._display_list.flush()
+        except TclError:
+            # The rest of the frame was not drawn, so neither the items nor
+            # the ids we handed out can be trusted any more
+            self._retained_items_invalid = True
+            self._sync_item_ids()
+            raise
+        if ((last_id is not None) and (last_id != self._next_item_id - 1)):
+            self._retained_items_invalid = True
+            self._next_item_id = last_id + 1
+
+    def _sync_item_ids(self):
+        item_id = Canvas.create_line(self, 0, 0, 0, 0)
+        Canvas.delete(self, item_id)
+        self._next_item_id = item_id + 1
+
+@functools.cache
+def _wrapped_pil_canvas_class():
+    # Defined on first use, so that PIL is only imported by headless apps
+    from uib_inf100_graphics.rendering import PilCanvas
+    class WrappedPilCanvas(_WrappedCanvasMixin, PilCanvas):
+        # Draws into an in-memory PIL image (no window or display needed)
+        def _image_from_pil_image(self, pil_image): return pil_image
+    return WrappedPilCanvas
 
 class App(object):
     major_version = MAJOR_VERSION
@@ -107,6 +361,8 @@ class App(object):
     version = f'{major_version}.{minor_version}'
     last_updated = LAST_UPDATED
     _theRoot = None # singleton Tkinter root object
+    _maxTimerCatchUpSteps = 5 # more missed timer deadlines than this are skipped
+    _bannerPrinted = False # the version is printed when the first app runs
 
     ####################################
     # User Methods:
@@ -127,13 +383,18 @@ class App(object):
     # Implementation:
     ####################################
 
-    def __init__(app, width=300, height=300, x=0, y=0, title=None, autorun=True, mvc_check=True, log_drawing_calls=True):
+    def __init__(app, width=300, height=300, x=0, y=0, title=None, autorun=True, mvc_check=True, log_drawing_calls=True, backend=None, skip_unchanged_redraws=True):
+        # Attributes set by a subclass before calling App.__init__ are part of
+        # the model (app.mode is left out, as it is set there by TopLevelApp)
+        app._modelFieldsBeforeInit = { key for key in app.__dict__ if ((not key.startswith('_')) and (key != 'mode')) }
         app.winx, app.winy, app.width, app.height = x, y, width, height
         app.timer_delay = 100     # milliseconds
-        app.mouse_movedDelay = 50 # ditto
+        app.target_fps = 60       # redraws are coalesced to at most this many per second
         app._title = title
         app._mvc_check = mvc_check
         app._log_drawing_calls = log_drawing_calls
+        app._skip_unchanged_redraws = skip_unchanged_redraws # set to False if redraw_all draws time-dependent content
+        app._backend = get_backend(backend) # 'tk', or 'pil' for headless (no window)
         app._running = app._paused = False
         app._mouse_pressed_outside_window = False
         if autorun: app.run()
@@ -152,6 +413,7 @@ class App(object):
         app._root.geometry(f'+{x}+{y}')
 
     def show_message(app, message):
+        if (app._backend == 'pil'): print(message); return
         messagebox.showinfo('show_message', message, parent=app._root)
 
     def get_user_input(app, prompt):
@@ -163,7 +425,9 @@ class App(object):
         if (path is None):
             path = filedialog.askopenfilename(initialdir=os.getcwd(), title='Select file: ',filetypes = (('Image files','*.png *.gif *.jpg'),('all files','*.*')))
             if (not path): return None
+        Image = lazy_import('PIL.Image', 'pillow')
         if (path.startswith('http')):
+            requests = lazy_import('requests')
             response = requests.request('GET', path) # path is a URL!
             image = Image.open(BytesIO(response.content))
         else:
@@ -172,14 +436,25 @@ class App(object):
 
     def scale_image(app, image, scale, antialias=False):
         # antialiasing is higher-quality but slower
+        Image = lazy_import('PIL.Image', 'pillow')
         resample = Image.ANTIALIAS if antialias else Image.NEAREST
         return image.resize((round(image.width*scale), round(image.height*scale)), resample=resample)
 
     def get_snapshot(app):
+        if (app._backend == 'pil'): return app._canvas.get_image()
+        if (app._log_drawing_calls):
+            # Rendered in-process from the logged calls of the last frame
+            # (with the border shown while paused, which is not logged),
+            # rather than grabbed from the screen
+            from uib_inf100_graphics.rendering import render_calls
+            calls = app._canvas.logged_drawing_calls
+            if (app._paused):
+                calls = [('create_rectangle', (0, 0, app.width, app.height), {'width':10, 'outline':'red'})] + calls
+            return render_calls(calls, app.width, app.height)
         app._show_root_window()
         x0 = app._root.winfo_rootx() + app._canvas.winfo_x()
         y0 = app._root.winfo_rooty() + app._canvas.winfo_y()
-        result = ImageGrabber.grab((x0,y0,x0+app.width,y0+app.height))
+        result = _image_grabber().grab((x0,y0,x0+app.width,y0+app.height))
         return result
 
     def save_snapshot(app):
@@ -194,14 +469,19 @@ class App(object):
 
     def quit(app):
         app._running = False
+        if (app._root is None): return # headless
         app._root.quit() # break out of root.mainloop() without closing window!
 
     def __setattr__(app, attr, val):
         d = app.__dict__
         d[attr] = val
+        if (not attr.startswith('_')):
+            # counts writes to app.mode, app.width etc. which are not part of the model hash
+            d['_publicWriteCount'] = d.get('_publicWriteCount', 0) + 1
+            if (attr == 'mode'): d['_handlers'] = None # TopLevelApp handlers depend on the mode
         canvas = d.get('_canvas', None)
-        if (d.get('running', False)
-                and d.get('mvc_check', False)
+        if (d.get('_running', False)
+                and d.get('_mvc_check', False)
                 and (canvas is not None) 
                 and canvas.in_redraw_all):
             app._mvc_violation(f'you may not change app.{attr} in the model while in redraw_all (the view)')
@@ -223,7 +503,12 @@ class App(object):
         if (len(print_lines) == 0):
             # No user code in trace, so we have to use all the code (bummer),
             # but not if we are in a redraw_all_wrapper...
-            if in_redraw_all_wrapper:
+            canvas_call = getattr(exception, 'canvas_call', None)
+            if (in_redraw_all_wrapper and (canvas_call is not None)):
+                # drawing calls are run when redraw_all has returned (see WrappedCanvas)
+                print_lines = ['    Error in a drawing call made in redraw_all (raised at the end of the frame):\n',
+                               f'    {canvas_call}\n']
+            elif in_redraw_all_wrapper:
                 print_lines = ['    No traceback available. Error occurred in redraw_all.\n']
             else:
                 print_lines = lines
@@ -253,6 +538,51 @@ class App(object):
     def _method_is_overridden(app, method_name):
         return (getattr(type(app), method_name) is not getattr(App, method_name))
 
+    # Event handlers looked up through the dispatch table (app._handlers)
+    _handlerNames = ('redraw_all', 'key_pressed', 'key_released', 'mouse_pressed',
+                     'mouse_released', 'mouse_moved', 'mouse_dragged', 'timer_fired')
+
+    def _build_handlers(app):
+        # Maps each handler name to the callable to use, or None if the app
+        # does not handle that event (so the event can be ignored right away)
+        return { name: (getattr(app, name) if app._method_is_overridden(name) else None)
+                 for name in App._handlerNames }
+
+    def _get_handler(app, name):
+        handlers = app.__dict__.get('_handlers', None)
+        if (handlers is None):
+            # built on first use, and again after app.mode changes (see __setattr__)
+            handlers = app.__dict__['_handlers'] = app._build_handlers()
+        return handlers[name]
+
+    def _set_model_fields(app):
+        # Everything App has set up so far is left out of the model
+        app._ignoredFields = (set(app.__dict__.keys()) - app._modelFieldsBeforeInit) | {'_ignoredFields'}
+
+    def _model_snapshot(app):
+        # Only the model (the attributes added by the user) is in the snapshot;
+        # changes to other attributes in redraw_all are caught by __setattr__.
+        # The snapshot of an immutable value (a number, a string, a tuple of
+        # those, ...) is kept for as long as the attribute refers to the same
+        # object, so only mutable values are copied again on every frame
+        d = app.__dict__
+        kept = app._immutableSnapshots
+        parts = [ ]
+        kind = _IMMUTABLE
+        for key in d:
+            if (key in app._ignoredFields): continue
+            value = d[key]
+            entry = kept.get(key, None)
+            if ((entry is not None) and (entry[0] is value)):
+                part, part_kind = entry[1], _IMMUTABLE
+            else:
+                part, part_kind = _snapshot(value)
+                if (part_kind == _IMMUTABLE): kept[key] = (value, part)
+                elif (entry is not None): del kept[key]
+            parts.append((key, part))
+            kind = min(kind, part_kind)
+        return tuple(parts), kind
+
     def _mvc_violation(app, errMsg):
         app._running = False
         raise Exception('MVC Violation: ' + errMsg)
@@ -261,119 +591,101 @@ class App(object):
     def _redraw_all_wrapper(app):
         if (not app._running): return
         if ('deferred_redraw_all' in app._afterIdMap): return # wait for pending call
+        snapshot1, kind = app._model_snapshot() if (app._mvc_check or app._skip_unchanged_redraws) else (None, _INEXACT)
+        # Only skipped when the snapshots show for certain that nothing the view
+        # depends on has changed (not if the model holds e.g. PIL images)
+        fingerprint = (snapshot1, app._paused, app._publicWriteCount) if (kind != _INEXACT) else None
+        if (app._skip_unchanged_redraws and (fingerprint is not None) and (fingerprint == app._lastFrameFingerprint)):
+            app._frameStats['unchanged'] += 1
+            return
         app._canvas.in_redraw_all = True
-        app._canvas.delete(ALL)
+        app._canvas._begin_frame()
         width,outline = (10,'red') if app._paused else (0,'white')
         app._canvas.create_rectangle(0, 0, app.width, app.height, width=width, outline=outline)
         app._canvas.logged_drawing_calls = [ ]
         app._canvas.log_drawing_calls = app._log_drawing_calls
-        hash1 = get_hash(app) if app._mvc_check else None
         try:
-            app.redraw_all(app._canvas)
-            hash2 = get_hash(app) if app._mvc_check else None
-            if (hash1 != hash2):
+            redraw_all = app._get_handler('redraw_all')
+            if (redraw_all is not None): redraw_all(app._canvas)
+            snapshot2 = app._model_snapshot()[0] if app._mvc_check else None
+            if (app._mvc_check and (snapshot1 != snapshot2)):
                 app._mvc_violation('you may not change the app state (the model) in redraw_all (the view)')
         finally:
+            app._canvas._end_frame()
             app._canvas.in_redraw_all = False
-        app._canvas.update()
+        app._lastRedrawTime = time.perf_counter()
+        app._lastFrameFingerprint = fingerprint
+        app._frameStats['frames'] += 1
 
     def _deferred_method_call(app, afterId, afterDelay, afterFn, replace=False):
         def afterFn_wrapper():
             app._afterIdMap.pop(afterId, None)
             afterFn()
+        if (app._root is None): return # headless: there is no event loop to defer to
         id = app._afterIdMap.get(afterId, None)
         if ((id is None) or replace):
             if id: app._root.after_cancel(id)
+            # afterDelay may also be 'idle' (run when all pending events are handled)
             app._afterIdMap[afterId] = app._root.after(afterDelay, afterFn_wrapper)
 
+    def _request_redraw(app):
+        # Marks the view as changed. The redraw happens once Tk is idle, but no
+        # sooner than 1/target_fps seconds after the last one, so a burst of
+        # events (such as key auto-repeat) results in a single redraw
+        app._frameStats['requested'] += 1
+        if (app._root is None): # headless: there is no event loop, redraw now
+            app._redraw_all_wrapper()
+        elif ('redraw_all_wrapper' in app._afterIdMap):
+            app._frameStats['coalesced'] += 1
+        else:
+            wait_ms = int(1000/app.target_fps - 1000*(time.perf_counter() - app._lastRedrawTime))
+            app._deferred_method_call(afterId='redraw_all_wrapper', afterDelay=wait_ms if (wait_ms > 0) else 'idle', afterFn=app._redraw_all_wrapper)
+
+    def get_frame_stats(app):
+        # frames: redraws done, requested: redraws asked for by event handlers,
+        # coalesced: requests merged into an already scheduled redraw,
+        # unchanged: redraws skipped because the model had not changed,
+        # ticks: calls to timer_fired, dropped_frames: ticks which were run to
+        # catch up and so never got a redraw of their own, skipped_ticks: ticks
+        # given up because the app was too far behind, lag_ms: how late the
+        # latest tick was
+        return dict(app._frameStats)
+
     def _deferred_redraw_all(app):
         app._deferred_method_call(afterId='deferred_redraw_all', afterDelay=100, afterFn=app._redraw_all_wrapper, replace=True)
 
     @_safe_method
     def _app_started_wrapper(app):
         app.app_started()
-        app._redraw_all_wrapper()
-
-    _keyNameMap = { '\t':'Tab', '\n':'Enter', '\r':'Enter', '\b':'Backspace',
-                   chr(127):'Delete', chr(27):'Escape', ' ':'Space' }
-
-    @staticmethod
-    def _use_event_key(attr):
-        raise Exception(f'Use event.key instead of event.{attr}')
-
-    @staticmethod
-    def _getEventKeyInfo(event, keysym, char):
-        key = c = char
-        has_control_key = (event.state & 0x4 != 0)
-        if ((c in [None, '']) or (len(c) > 1) or (ord(c) > 255)):
-            key = keysym
-            if (key.endswith('_L') or
-                key.endswith('_R') or
-                key.endswith('_Lock')):
-                key = 'Modifier_Key'
-        elif (c in App._keyNameMap):
-            key = App._keyNameMap[c]
-        elif ((len(c) == 1) and (1 <= ord(c) <= 26)):
-            key = chr(ord('a')-1 + ord(c))
-            has_control_key = True
-        if has_control_key and (len(key) == 1):
-            # don't add control- prefix to Enter, Tab, Escape, ...
-            key = 'control-' + key
-        return key
-
-    class EventWrapper(Event):
-        def __init__(self, event):
-            for key in event.__dict__:
-                if (not key.startswith('__')):
-                    self.__dict__[key] = event.__dict__[key]
-
-    class MouseEventWrapper(EventWrapper):
-        def __repr__(self):
-            return f'Event(x={self.x}, y={self.y})'
-
-    class KeyEventWrapper(EventWrapper):
-        def __init__(self, event):
-            keysym, char = event.keysym, event.char
-            del event.keysym
-            del event.char
-            super().__init__(event)
-            self.key = App._getEventKeyInfo(event, keysym, char)
-            self.ctrl  = (event.state & 0x4) != 0
-            self.alt   = (event.state & 0x8) != 0 or (event.state & 0x80) != 0
-            self.shift = (event.state & 0x1) != 0
-        def __repr__(self):
-            return f'Event(key={repr(self.key)})'
-        keysym = property(lambda *args: App._use_event_key('keysym'),
-                          lambda *args: App._use_event_key('keysym'))
-        char =   property(lambda *args: App._use_event_key('char'),
-                          lambda *args: App._use_event_key('char'))
+        app._request_redraw()
 
     @_safe_method
     def _key_pressed_wrapper(app, event):
-        event = App.KeyEventWrapper(event)
         if (event.key == 'control-s'):
             app.save_snapshot()
         elif (event.key == 'control-p'):
             app.toggle_paused()
-            app._redraw_all_wrapper()
+            app._request_redraw()
         elif (event.key == 'control-q'):
             app.quit()
         elif (event.key == 'control-x'):
             os._exit(0) # hard exit avoids tkinter error messages
         elif (app._running and
               (not app._paused) and
-              app._method_is_overridden('key_pressed') and
               (not event.key == 'Modifier_Key')):
-            app.key_pressed(event)
-            app._redraw_all_wrapper()
+            key_pressed = app._get_handler('key_pressed')
+            if (key_pressed is None): return
+            key_pressed(event)
+            app._request_redraw()
 
     @_safe_method
     def _key_released_wrapper(app, event):
-        if (not app._running) or app._paused or (not app._method_is_overridden('key_released')): return
-        event = App.KeyEventWrapper(event)
+        if (not app._running) or app._paused: return
+        key_released = app._get_handler('key_released')
+        if (key_released is None): return
         if (not event.key == 'Modifier_Key'):
-            app.key_released(event)
-            app._redraw_all_wrapper()
+            key_released(event)
+            app._request_redraw()
 
     @_safe_method
     def _mouse_pressed_wrapper(app, event):
@@ -385,10 +697,10 @@ class App(object):
             app._mouse_pressed_outside_window = False
             app._mouse_is_pressed = True
             app._lastMousePosn = (event.x, event.y)
-            if (app._method_is_overridden('mouse_pressed')):
-                event = App.MouseEventWrapper(event)
-                app.mouse_pressed(event)
-                app._redraw_all_wrapper()
+            mouse_pressed = app._get_handler('mouse_pressed')
+            if (mouse_pressed is not None):
+                mouse_pressed(event)
+                app._request_redraw()
 
     @_safe_method
     def _mouse_released_wrapper(app, event):
@@ -399,18 +711,42 @@ class App(object):
             app._size_changed_wrapper()
         else:
             app._lastMousePosn = (event.x, event.y)
-            if (app._method_is_overridden('mouse_released')):
-                event = App.MouseEventWrapper(event)
-                app.mouse_released(event)
-                app._redraw_all_wrapper()
+            mouse_released = app._get_handler('mouse_released')
+            if (mouse_released is not None):
+                mouse_released(event)
+                app._request_redraw()
 
     @_safe_method
     def _timer_fired_wrapper(app):
+        # Fixed timestep: timer_fired is due every timer_delay ms counted from
+        # the previous deadline (not from when the previous call finished), so
+        # the time spent in timer_fired and redraw_all does not slow the app
+        # down. When late, timer_fired is called once per missed deadline (up
+        # to _maxTimerCatchUpSteps) with a single redraw afterwards
+        # (TopLevelApp keeps ticking, since a timer_fired may appear with app.mode)
         if (not app._running) or (not app._method_is_overridden('timer_fired')): return
-        if (not app._paused):
-            app.timer_fired()
-            app._redraw_all_wrapper()
-        app._deferred_method_call(afterId='_timer_fired_wrapper', afterDelay=app.timer_delay, afterFn=app._timer_fired_wrapper)
+        now = time.perf_counter()
+        delay = app.timer_delay / 1000
+        if ((app._nextTimerTime is None) or (delay <= 0) or (app._root is None)):
+            app._nextTimerTime = now # no deadline to keep (headless: one tick per call)
+        if (app._paused):
+            app._nextTimerTime = now + delay
+        else:
+            lag = max(0, now - app._nextTimerTime)
+            due = 1 if (delay <= 0) else 1 + int(lag // delay)
+            steps = min(due, App._maxTimerCatchUpSteps)
+            app._frameStats['ticks'] += steps
+            app._frameStats['dropped_frames'] += steps - 1
+            app._frameStats['skipped_ticks'] += due - steps
+            app._frameStats['lag_ms'] = round(lag * 1000)
+            for _ in range(steps):
+                timer_fired = app._get_handler('timer_fired') # may change with app.mode
+                if (timer_fired is not None): timer_fired()
+                if (not app._running): return
+            app._nextTimerTime += due * delay
+            app._request_redraw()
+        wait_ms = round(1000 * (app._nextTimerTime - time.perf_counter()))
+        app._deferred_method_call(afterId='_timer_fired_wrapper', afterDelay=max(0, wait_ms), afterFn=app._timer_fired_wrapper)
 
     @_safe_method
     def _size_changed_wrapper(app, event=None):
@@ -428,30 +764,34 @@ class App(object):
                 app.size_changed()
                 app._deferred_redraw_all() # avoid resize crashing on some platforms
 
+    def _mouse_motion_event(app, event):
+        # Bound to <Motion> and <B1-Motion>. Only the latest position is kept,
+        # and it is delivered once Tk has handled all pending events, so a burst
+        # of motion events results in a single mouse_moved/mouse_dragged call
+        app._pendingMouseMotionEvent = event
+        if ((app._get_handler('mouse_moved') is not None) or (app._get_handler('mouse_dragged') is not None)):
+            app._deferred_method_call(afterId='mouse_motion_wrapper', afterDelay='idle', afterFn=app._mouse_motion_wrapper)
+
     @_safe_method
     def _mouse_motion_wrapper(app):
-        if (not app._running): return
-        mouse_moved_exists = app._method_is_overridden('mouse_moved')
-        mouse_dragged_exists = app._method_is_overridden('mouse_dragged')
+        if (not app._running) or (app._pendingMouseMotionEvent is None): return
+        event = app._pendingMouseMotionEvent
+        app._pendingMouseMotionEvent = None
+        handler = app._get_handler('mouse_dragged' if app._mouse_is_pressed else 'mouse_moved')
         if ((not app._paused) and
             (not app._mouse_pressed_outside_window) and
-            (((not app._mouse_is_pressed) and mouse_moved_exists) or
-             (app._mouse_is_pressed and mouse_dragged_exists))):
-            class MouseMotionEvent(object): pass
-            event = MouseMotionEvent()
-            root = app._root
-            event.x = root.winfo_pointerx() - root.winfo_rootx()
-            event.y = root.winfo_pointery() - root.winfo_rooty()
-            event = App.MouseEventWrapper(event)
+            (handler is not None)):
             if ((app._lastMousePosn !=  (event.x, event.y)) and
                 (event.x >= 0) and (event.x <= app.width) and
                 (event.y >= 0) and (event.y <= app.height)):
-                if (app._mouse_is_pressed): app.mouse_dragged(event)
-                else: app.mouse_moved(event)
+                handler(event)
                 app._lastMousePosn = (event.x, event.y)
-                app._redraw_all_wrapper()
-        if (mouse_moved_exists or mouse_dragged_exists):
-            app._deferred_method_call(afterId='mouse_motion_wrapper', afterDelay=app.mouse_movedDelay, afterFn=app._mouse_motion_wrapper)
+                app._request_redraw()
+
+    @staticmethod
+    def _bind_tk(widget, sequence, substitutions, callback):
+        # callback is called with the (string) values of the substitutions
+        widget.bind(sequence, f'{widget.register(callback)} {substitutions}')
 
     def update_title(app):
         app._title = app._title or type(app).__name__
@@ -476,19 +816,35 @@ class App(object):
 
     @_safe_method
     def run(app):
+        if (not App._bannerPrinted):
+            App._bannerPrinted = True
+            print(f'Loaded uib_inf100_graphics version {App.version} (last updated {App.last_updated})')
         app._mouse_is_pressed = False
         app._lastMousePosn = (-1, -1)
+        app._pendingMouseMotionEvent = None
+        app._handlers = None
+        app._lastRedrawTime = 0
+        app._nextTimerTime = None
+        app._lastFrameFingerprint = None
+        app._immutableSnapshots = { } # see _model_snapshot
+        app._frameStats = { 'frames': 0, 'requested': 0, 'coalesced': 0, 'unchanged': 0,
+                            'ticks': 0, 'dropped_frames': 0, 'skipped_ticks': 0, 'lag_ms': 0 }
         app._lastWindowDims= None # set in size_changed_wrapper
         app._afterIdMap = dict()
+        if (app._backend == 'pil'):
+            app._run_headless()
+            return
         # create the singleton root window
         if (App._theRoot is None):
             App._theRoot = Tk()
             App._theRoot.createcommand('exit', lambda: '') # when user enters cmd-q, ignore here (handled in key_pressed)
             App._theRoot.protocol('WM_DELETE_WINDOW', lambda: App._theRoot.app.quit()) # when user presses 'x' in title bar
-            App._theRoot.bind("<Button-1>", lambda event: App._theRoot.app._mouse_pressed_wrapper(event))
-            App._theRoot.bind("<B1-ButtonRelease>", lambda event: App._theRoot.app._mouse_released_wrapper(event))
-            App._theRoot.bind("<KeyPress>", lambda event: App._theRoot.app._key_pressed_wrapper(event))
-            App._theRoot.bind("<KeyRelease>", lambda event: App._theRoot.app._key_released_wrapper(event))
+            # Key and mouse events are built straight from Tk's %-substitutions
+            # (instead of letting tkinter build a full Event object)
+            App._bind_tk(App._theRoot, "<Button-1>", '%x %y', lambda x, y: App._theRoot.app._mouse_pressed_wrapper(MouseEvent(int(x), int(y))))
+            App._bind_tk(App._theRoot, "<B1-ButtonRelease>", '%x %y', lambda x, y: App._theRoot.app._mouse_released_wrapper(MouseEvent(int(x), int(y))))
+            App._bind_tk(App._theRoot, "<KeyPress>", '%K %A %s', lambda *args: App._theRoot.app._key_pressed_wrapper(KeyEvent._from_tk(*args)))
+            App._bind_tk(App._theRoot, "<KeyRelease>", '%K %A %s', lambda *args: App._theRoot.app._key_released_wrapper(KeyEvent._from_tk(*args)))
             App._theRoot.bind("<Configure>", lambda event: App._theRoot.app._size_changed_wrapper(event))
         else:
             App._theRoot.canvas.destroy()
@@ -499,13 +855,14 @@ class App(object):
         # create the canvas
         root.canvas = app._canvas = WrappedCanvas(app)
         app._canvas.pack(fill=BOTH, expand=YES)
+        App._bind_tk(app._canvas, '<Motion>', '%x %y', lambda x, y: app._mouse_motion_event(MouseEvent(int(x), int(y))))
+        App._bind_tk(app._canvas, '<B1-Motion>', '%x %y', lambda x, y: app._mouse_motion_event(MouseEvent(int(x), int(y))))
         # initialize, start the timer, and launch the app
         app._running = True
         app._paused = False
-        app._ignoredFields = set(app.__dict__.keys()) | {'_ignoredFields'}
+        app._set_model_fields()
         app._app_started_wrapper()
         app._timer_fired_wrapper()
-        app._mouse_motion_wrapper()
         app._show_root_window()
         root.mainloop()
         app._hide_root_window()
@@ -515,6 +872,18 @@ class App(object):
         app.app_stopped()
         print(app.get_quit_message())
 
+    def _run_headless(app):
+        # Draws into an in-memory image instead of a window, and returns right
+        # after app_started without entering an event loop. The caller drives
+        # the app by calling its methods (e.g. app._timer_fired_wrapper()) and
+        # reads the result with app.get_snapshot()
+        app._root = None
+        app._canvas = _wrapped_pil_canvas_class()(app)
+        app._running = True
+        app._paused = False
+        app._set_model_fields()
+        app._app_started_wrapper()
+
 ####################################
 # TopLevelApp:
 # (with top-level functions not subclassses and methods)
@@ -542,6 +911,18 @@ class TopLevelApp(App):
         app.mode = None
         super().__init__(**kwargs)
 
+    def _build_handlers(app):
+        # Looks up the top-level functions once (instead of on every event),
+        # e.g. 'key_pressed', or 'game_key_pressed' when app.mode == 'game'
+        prefix = app._fnPrefix
+        if ((app.mode != None) and (app.mode != '')):
+            prefix += app.mode + '_'
+        handlers = dict()
+        for name in App._handlerNames:
+            fn = app._callersGlobals.get(prefix + name, None)
+            handlers[name] = functools.partial(fn, app) if (fn is not None) else None
+        return handlers
+
     def _callFn(app, fn, *args):
         isAppStopped = fn == 'app_stopped'
         isUsingMode = (app.mode != None) and (app.mode != '')
@@ -572,5 +953,3 @@ class TopLevelApp(App):
 ####################################
 
 run_app = TopLevelApp
-
-print(f'Loaded uib_inf100_graphics version {App.version} (last updated {App.last_updated})')
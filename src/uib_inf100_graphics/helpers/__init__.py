@@ -1,2 +1,2 @@
-from .text import text_in_box
+from .text import text_in_box, text_in_boxes, font_pool_stats
 from .image import load_image, load_image_http, scaled_image, image_in_box
\ No newline at end of file
@@ -4,7 +4,6 @@ from tkinter import filedialog, Canvas
 from typing import Literal
 
 from PIL import Image
-import requests
 
 from uib_inf100_graphics.helpers.logger import _warning
 
@@ -28,6 +27,8 @@ def load_image_http(url: str) -> Image.Image:
     requests.exceptions.RequestException
         If the image cannot be loaded.
     """
+    # Imported here, since importing requests is slow and it is rarely needed
+    import requests
     return Image.open(BytesIO(requests.get(url).content))
 
 def load_image(path: str|None=None) -> Image.Image | None:
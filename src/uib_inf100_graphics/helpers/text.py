@@ -1,7 +1,10 @@
+import math
+import tkinter
+from collections import OrderedDict
 from tkinter import Canvas
 from tkinter.font import Font, nametofont
 from tkinter import TclError
-from typing import Literal, Callable
+from typing import Any, Literal, Callable, Sequence
 
 from uib_inf100_graphics.helpers.logger import _warning
 
@@ -13,7 +16,7 @@ def text_in_box(
             x1: float, y1: float, x2: float, y2: float,
             text: str,
             font: str|Font|tuple[str, int, str]|None=None,
-            fit_mode: Literal['contain', 'fill', 'height', 'width']='contain',
+            fit_mode: Literal['contain', 'fill', 'height', 'width', 'wrap']='contain',
             padding: float=0,
             min_font_size: int=1,
             justify: Literal['left', 'center', 'right']='center',
@@ -58,7 +61,7 @@ def text_in_box(
         a font specifier tuple. If the font is not found, the default
         font will be used.
 
-    fit_mode : Literal['contain', 'fill', 'height', 'width'], optional
+    fit_mode : Literal['contain', 'fill', 'height', 'width', 'wrap'], optional
         The mode to use for fitting the text into the rectangle. If 'contain',
         the text will be scaled to fit entirely within the rectangle (default).
         If 'fill', the text will be scaled to fill the rectangle, and may
@@ -66,7 +69,11 @@ def text_in_box(
         text will be scaled to fit the height of the rectangle (the width
         of the rectangle will be ignored). If 'width', the text will be scaled
         to fit the width of the rectangle (the height of the rectangle will be
-        ignored).
+        ignored). If 'wrap', the text will be broken into lines between words
+        (in addition to its own line breaks), choosing the line breaks which
+        allow the largest font size with which the text fits entirely within
+        the rectangle; a word which does not fit on a line of its own at the
+        minimum font size will overflow.
     padding : float, optional
         The padding to leave around the text relative to the bounding box.
         Defaults to 0. The padding is the same on all sides of the box.
@@ -87,15 +94,139 @@ def text_in_box(
     Raises
     ------
     ValueError
-        If fit_mode is not one of 'contain', 'fill', 'height', or 'width',
+        If fit_mode is not one of 'contain', 'fill', 'height', 'width', or 'wrap',
         or if justify is not one of 'left', 'center', or 'right', or if
         align is not one of 'top', 'center', or 'bottom', or if
         min_font_size is not a positive integer
     """
-    # Validate arguments
-    if fit_mode not in ['contain', 'fill', 'height', 'width']:
+    _validate_arguments(fit_mode, justify, align, min_font_size)
+
+    # Clean up kwargs
+    if "anchor" in kwargs:
+        del kwargs["anchor"]
+
+    # Get the font
+    font = _get_font(font, canvas)
+
+    # Calculate the font size based on longest line and number of lines total
+    # (or, when wrapping, also where to break the lines)
+    layout = _get_text_layout(x1, y1, x2, y2, text, font, fit_mode,
+                              padding, min_font_size)
+    if layout is None:
+        return # Nothing to draw
+    fontsize, text = layout
+
+    # Calculate the position and create the text
+    x, y, anchor = _get_text_position(x1, y1, x2, y2, justify, align, padding)
+    return canvas.create_text(x, y, text=text,
+                              font=_font_pool.sized(font, fontsize),
+                              anchor=anchor, justify=justify, **kwargs)
+
+
+def text_in_boxes(
+            canvas: Canvas,
+            boxes: Sequence[tuple[float, float, float, float]],
+            texts: Sequence[str],
+            font: str|Font|tuple[str, int, str]|None=None,
+            fit_mode: Literal['contain', 'fill', 'height', 'width', 'wrap']='contain',
+            padding: float=0,
+            min_font_size: int=1,
+            justify: Literal['left', 'center', 'right']='center',
+            align: Literal['top', 'center', 'bottom']='center',
+            common_size: bool=False,
+            **kwargs) -> list[int|None]:
+    """
+    Draws each text into its rectangle, like calling text_in_box once for
+    each of them, but faster for grids of labels: the font size is only
+    calculated once for each distinct combination of box size and text
+    lines, and all the text is drawn in the same font. If common_size is
+    True, all the texts are drawn with the same font size, namely the
+    smallest of the sizes that would have been used for each of them.
+
+    
+    Positional parameters
+    ----------
+    canvas : Canvas
+        The canvas to draw on.
+    boxes : Sequence[tuple[float, float, float, float]]
+        The rectangles (x1, y1, x2, y2) to draw the texts into.
+    texts : Sequence[str]
+        The texts to draw, one for each rectangle.
+
+    Optional parameters
+    ----------
+    common_size : bool, optional
+        Whether to use the same font size for all the texts. Defaults to
+        False.
+
+    The other optional parameters are the same as for text_in_box.
+
+    Returns
+    -------
+    list[int|None]
+        The ids of the text objects created, one for each rectangle (None
+        where the text is empty, and nothing is drawn).
+
+    Raises
+    ------
+    ValueError
+        If boxes and texts are not of the same length, and in the same
+        cases as text_in_box.
+    """
+    _validate_arguments(fit_mode, justify, align, min_font_size)
+    if len(boxes) != len(texts):
+        raise ValueError(f"boxes and texts must be of the same length, but"
+                         + f" got {len(boxes)} boxes and {len(texts)} texts")
+    if "anchor" in kwargs:
+        del kwargs["anchor"]
+    font = _get_font(font, canvas)
+
+    # Cells with the same box size and text lines get the same font size
+    # (when wrapping, the whole text matters, not only its longest line)
+    layouts: list[tuple[int, str]|None] = []
+    solved: dict[tuple[float, float, int, str], tuple[int, str]|None] = {}
+    for (x1, y1, x2, y2), text in zip(boxes, texts):
+        lines = text.split("\n")
+        group = (abs(x2 - x1), abs(y2 - y1), len(lines),
+                 text if fit_mode == 'wrap' else max(lines, key=len))
+        if group not in solved:
+            solved[group] = _get_text_layout(x1, y1, x2, y2, text, font,
+                                             fit_mode, padding, min_font_size)
+        layout = solved[group]
+        if layout is not None and fit_mode != 'wrap':
+            layout = (layout[0], text)
+        layouts.append(layout)
+    if common_size:
+        common_fontsize = min((layout[0] for layout in layouts if layout is not None),
+                              default=min_font_size)
+        measured = _MeasuredFont(font)
+        for i, ((x1, y1, x2, y2), text) in enumerate(zip(boxes, texts)):
+            if layouts[i] is None:
+                continue
+            if fit_mode == 'wrap':
+                max_width = max(0, abs(x2 - x1) - 2*padding)
+                text = "\n".join(_wrap_lines(text, measured, common_fontsize, max_width)[0])
+            layouts[i] = (common_fontsize, text)
+
+    ids: list[int|None] = []
+    for (x1, y1, x2, y2), layout in zip(boxes, layouts):
+        if layout is None:
+            ids.append(None)
+            continue
+        fontsize, text = layout
+        x, y, anchor = _get_text_position(x1, y1, x2, y2, justify, align, padding)
+        ids.append(canvas.create_text(x, y, text=text,
+                                      font=_font_pool.sized(font, fontsize),
+                                      anchor=anchor, justify=justify, **kwargs))
+    return ids
+
+
+def _validate_arguments(fit_mode: str, justify: str, align: str,
+                        min_font_size: int) -> None:
+    """Raise ValueError if an argument to text_in_box is not valid."""
+    if fit_mode not in ['contain', 'fill', 'height', 'width', 'wrap']:
         raise ValueError("fit_mode must be one of 'contain', 'fill', 'height',"
-                         + f" or 'width', but got '{fit_mode}'")
+                         + f" 'width', or 'wrap', but got '{fit_mode}'")
     if justify not in ['left', 'center', 'right']:
         raise ValueError("justify must be one of 'left', 'center', or 'right',"
                          + f" but got '{justify}'")
@@ -105,28 +236,102 @@ def text_in_box(
     if min_font_size < 1:
         raise ValueError(f"min_font_size must >= 1, but got {min_font_size}")
 
-    # Clean up kwargs
-    if "anchor" in kwargs:
-        del kwargs["anchor"]
-
-    # Get the font
-    font = _get_font(font)
 
-    # Calculate the font size based on longest line and number of lines total
+def _get_text_layout(x1: float, y1: float, x2: float, y2: float,
+                     text: str, font: Font,
+                     fit_mode: Literal['contain', 'fill', 'height', 'width', 'wrap'],
+                     padding: float, min_font_size: int) -> tuple[int, str]|None:
+    """
+    Calculate the font size for the text in the box, based on the longest
+    line and the number of lines, and return it with the text to draw
+    (which has line breaks added if fit_mode is 'wrap'). Returns None if
+    there is nothing to draw.
+    """
+    max_width = max(0, abs(x2 - x1) - 2*padding)
+    if fit_mode == 'wrap':
+        return _get_wrapped_layout(text, font, max_width,
+                                   max(0, abs(y2 - y1) - 2*padding),
+                                   min_font_size)
     number_of_lines = text.count("\n") + 1
     longest_line = max(text.split("\n"), key=len)
     if len(longest_line) <= 0:
-        return # Nothing to draw
-    max_width = max(0, abs(x2 - x1) - 2*padding)
+        return None
     max_height = max(0, abs(y2 - y1) - 2*padding)/number_of_lines
-    fontsize = _get_fontsize(longest_line, font, max_width, max_height,
-                            fit_mode, min_font_size)
-    font.configure(size=fontsize)
+    return _get_fontsize(longest_line, font, max_width, max_height,
+                         fit_mode, min_font_size), text
 
-    # Calculate the position and create the text
-    x, y, anchor = _get_text_position(x1, y1, x2, y2, justify, align, padding)
-    return canvas.create_text(x, y, text=text, font=font, anchor=anchor,
-                              justify=justify, **kwargs)
+
+# Layouts found for fit_mode 'wrap', by (text, max_width, max_height,
+# font, min_font_size), so that redrawing the same text is cheap
+_wrapped_layouts: OrderedDict[tuple[str, float, float, tuple[str, str, str], int],
+                              tuple[int, str]|None] = OrderedDict()
+_MAX_WRAPPED_LAYOUTS = 1024
+
+def _get_wrapped_layout(text: str, font: Font, max_width: float,
+                        max_height: float,
+                        min_font_size: int) -> tuple[int, str]|None:
+    """
+    Find the largest font size with which the text, broken into lines
+    between words where necessary, fits within max_width and max_height,
+    and return it with the text broken into lines. Returns None if the
+    text has no words.
+    """
+    measured = _MeasuredFont(font)
+    key = (text, max_width, max_height, measured.key, min_font_size)
+    if key in _wrapped_layouts:
+        _wrapped_layouts.move_to_end(key)
+        return _wrapped_layouts[key]
+
+    layout: tuple[int, str]|None = None
+    if text.split():
+        def get_height(fontsize: int) -> float:
+            lines, fits_width = _wrap_lines(text, measured, fontsize, max_width)
+            if not fits_width:
+                return math.inf
+            return len(lines) * measured.linespace(fontsize)
+        fontsize = _estimate_maximize_int_outcome_below(max_height, get_height,
+                                                        min_font_size)
+        lines, _ = _wrap_lines(text, measured, fontsize, max_width)
+        # The lines are broken by the widths of their glyphs, which may add
+        # up to a little less than the width of a line as drawn
+        while fontsize > min_font_size and any(
+                measured.text_width(fontsize, line) > max_width for line in lines):
+            fontsize -= 1
+            lines, _ = _wrap_lines(text, measured, fontsize, max_width)
+        layout = (fontsize, "\n".join(lines))
+
+    _wrapped_layouts[key] = layout
+    if len(_wrapped_layouts) > _MAX_WRAPPED_LAYOUTS:
+        _wrapped_layouts.popitem(last=False)
+    return layout
+
+def _wrap_lines(text: str, font: '_MeasuredFont', size: int,
+                max_width: float) -> tuple[list[str], bool]:
+    """
+    Break the text into lines no wider than max_width at the given font
+    size, by putting as many words as possible on each line (the line
+    breaks in the text are kept). Returns the lines, and whether they all
+    fit, which they do not if a single word is wider than max_width.
+    """
+    space_width = font.measure(size, " ")
+    lines: list[str] = []
+    fits_width = True
+    for paragraph in text.split("\n"):
+        line: list[str] = []
+        line_width = 0
+        for word in paragraph.split():
+            word_width = font.word_width(size, word)
+            if line and line_width + space_width + word_width <= max_width:
+                line.append(word)
+                line_width += space_width + word_width
+                continue
+            if line:
+                lines.append(" ".join(line))
+            line = [word]
+            line_width = word_width
+            fits_width = fits_width and word_width <= max_width
+        lines.append(" ".join(line))
+    return lines, fits_width
 
 
 def _get_text_position(x1: float, y1: float, x2: float, y2: float,
@@ -160,22 +365,156 @@ def _get_fontsize(text: str, font: Font, max_width: float, max_height: float,
                  fit_mode: Literal['contain', 'fill', 'height', 'width'],
                  min_font_size: int) -> int:
     """Calculate the font size to use for the text."""
+    measured = _MeasuredFont(font)
     if fit_mode == 'contain':
-        return min(_fontsize_fit_height(max_height, font, min_font_size),
-                   _fontsize_fit_width(max_width, font, text, min_font_size))
+        return min(_fontsize_fit_height(max_height, measured, min_font_size),
+                   _fontsize_fit_width(max_width, measured, text, min_font_size))
     elif fit_mode == 'fill':
-        return max(_fontsize_fit_height(max_height, font, min_font_size),
-                   _fontsize_fit_width(max_width, font, text, min_font_size))
+        return max(_fontsize_fit_height(max_height, measured, min_font_size),
+                   _fontsize_fit_width(max_width, measured, text, min_font_size))
     elif fit_mode == 'height':
-        return _fontsize_fit_height(max_height, font, min_font_size)
+        return _fontsize_fit_height(max_height, measured, min_font_size)
     elif fit_mode == 'width':
-        return _fontsize_fit_width(max_width, font, text, min_font_size)
+        return _fontsize_fit_width(max_width, measured, text, min_font_size)
     else:
         raise ValueError(f"Unknown fit_mode '{fit_mode}'")
 
 
-def _get_font(font_spec: str|Font|tuple[str, int, str]|None) -> Font:
-    """Get a font object from a font specification."""
+FontKey = tuple[str, str, str, int, int]
+
+class _FontPool:
+    """
+    A process-wide pool of Font objects, so that text_in_box does not
+    create new fonts in Tcl on every call. Fonts are keyed by the Tcl
+    interpreter they belong to (a font can only be used with the Tk
+    root it was created in), and by their actual (family, weight, slant,
+    underline, overstrike):
+
+      - for each key, one font is used for measuring, and is resized
+        freely (see _FontMetricsCache);
+      - for each key and size, one font is handed out for drawing. Its
+        size is never changed, since Tk redraws all text items using a
+        font when it changes. At most max_fonts such fonts are kept;
+        the least recently used is dropped from the pool, but is only
+        deleted in Tcl when the Font object is garbage collected, as a
+        recorded frame which is yet to be drawn may still use it.
+
+    The counters created, hits and evictions count the fonts created for
+    drawing, the requests answered with an existing font, and the fonts
+    evicted.
+    """
+
+    def __init__(self, max_fonts: int=256, max_specs: int=1024):
+        self.max_fonts: int = max_fonts
+        self.max_specs: int = max_specs
+        self._specs: OrderedDict[tuple[Any, Any], Font] = OrderedDict()
+        self._measuring: dict[tuple[Any, FontKey], Font] = {}
+        self._keys: dict[str, FontKey] = {}
+        self._sized: OrderedDict[tuple[Any, FontKey, int], Font] = OrderedDict()
+        self.created: int = 0
+        self.hits: int = 0
+        self.evictions: int = 0
+
+    def get(self, font_spec: str|Font|tuple[str, int, str]|None) -> Font:
+        """Returns the font used for measuring the given font spec."""
+        if isinstance(font_spec, Font):
+            # May have been reconfigured since, so it is looked at anew,
+            # and it is copied rather than resized
+            return self._measuring_font(font_spec, copy=True)
+        if isinstance(font_spec, list):
+            font_spec = tuple(font_spec)
+        # Fonts are created from specs in the default root
+        spec_key = (tkinter._get_default_root('use font').tk, font_spec)
+        try:
+            font = self._specs.get(spec_key, None)
+        except TypeError: # Not hashable, such as a tuple with a list
+            return self._measuring_font(_create_font(font_spec), copy=False)
+        if font is None:
+            font = self._measuring_font(_create_font(font_spec), copy=False)
+            self._specs[spec_key] = font
+            if len(self._specs) > self.max_specs:
+                self._specs.popitem(last=False)
+        else:
+            self._specs.move_to_end(spec_key)
+        return font
+
+    def key(self, font: Font) -> FontKey:
+        """Returns the key of a font, which need not be from the pool."""
+        key = self._keys.get(font.name, None)
+        if key is None:
+            actual = font.actual()
+            key = (actual['family'], actual['weight'], actual['slant'],
+                   int(actual['underline']), int(actual['overstrike']))
+        return key
+
+    def sized(self, font: Font, size: int) -> Font:
+        """Returns a font for drawing, like font but with the given size."""
+        key = self.key(font)
+        sized_key = (font._tk, key, size)
+        sized_font = self._sized.get(sized_key, None)
+        if sized_font is not None:
+            self.hits += 1
+            self._sized.move_to_end(sized_key)
+            return sized_font
+        family, weight, slant, underline, overstrike = key
+        sized_font = Font(root=font._tk, family=family, size=size, weight=weight,
+                          slant=slant, underline=underline, overstrike=overstrike)
+        self.created += 1
+        self._sized[sized_key] = sized_font
+        while len(self._sized) > self.max_fonts:
+            self._sized.popitem(last=False)
+            self.evictions += 1
+        return sized_font
+
+    def stats(self) -> dict[str, int]:
+        """Returns the counters, and the number of fonts in the pool."""
+        return {
+            "fonts": len(self._sized) + len(self._measuring),
+            "created": self.created,
+            "hits": self.hits,
+            "evictions": self.evictions,
+        }
+
+    def _measuring_font(self, font: Font, copy: bool) -> Font:
+        key = self.key(font)
+        pooled_font = self._measuring.get((font._tk, key), None)
+        if pooled_font is None:
+            pooled_font = font.copy() if copy else font
+            self._measuring[(font._tk, key)] = pooled_font
+            self._keys[pooled_font.name] = key
+        return pooled_font
+
+
+_font_pool: _FontPool = _FontPool()
+
+
+def font_pool_stats() -> dict[str, int]:
+    """
+    Returns counters for the pool of fonts used by text_in_box: fonts is
+    the number of fonts currently in the pool, created the number of
+    fonts created for drawing text, hits the number of times an
+    existing font was reused, and evictions the number of fonts dropped
+    from the pool to keep it small.
+    """
+    return _font_pool.stats()
+
+
+def _get_font(font_spec: str|Font|tuple[str, int, str]|None,
+              canvas: Canvas|None=None) -> Font:
+    """
+    Get a font object from a font specification, from the pool of fonts.
+    Fonts can only be created once there is a Tk root, so a canvas which
+    only records calls for a window not shown yet (see
+    uib_inf100_graphics.simple) is first asked to create it.
+    """
+    ensure_root = getattr(canvas, '_ensure_root', None)
+    if ensure_root is not None:
+        ensure_root()
+    return _font_pool.get(font_spec)
+
+
+def _create_font(font_spec: str|Font|tuple[str, int, str]|None) -> Font:
+    """Create a font object from a font specification."""
     if isinstance(font_spec, Font):
         return font_spec
     if isinstance(font_spec, str):
@@ -236,28 +575,205 @@ def string_to_font(s: str) -> Font:
                        slant=slant, underline=underline, overstrike=overstrike)
 
 
-def _fontsize_fit_height(max_height: float, font: Font,
+class _FontMetrics:
+    """
+    The linespace and glyph advance widths of a font at one size, the
+    widths of words measured for wrapping text, and the widths of lines
+    of text as measured by Tk.
+    """
+    __slots__ = ('linespace', 'widths', 'word_widths', 'text_widths')
+
+    def __init__(self, linespace: int):
+        self.linespace: int = linespace
+        self.widths: dict[str, int] = {}
+        self.word_widths: dict[str, int] = {}
+        self.text_widths: dict[str, int] = {}
+
+
+class _FontMetricsCache:
+    """
+    A process-wide cache of font metrics, keyed by (family, weight, slant,
+    size). The linespace of a font at a size is measured once, and so is
+    the advance width of each glyph; the width of a line of text is then
+    the sum of the widths of its glyphs. This may be a little less than
+    the width Tk draws the text with (with kerning, or glyph widths which
+    are not whole pixels), so the font size finally chosen is checked
+    with text_width, which measures the whole text in Tk. At most
+    max_entries font sizes are kept; the least recently used are evicted
+    first.
+    """
+
+    def __init__(self, max_entries: int=512):
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[tuple[str, str, str, int], _FontMetrics] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, font: Font, key: tuple[str, str, str], size: int) -> _FontMetrics:
+        """
+        Returns the metrics of font at size, where key is the (family,
+        weight, slant) of font. The font may be reconfigured to size.
+        """
+        entry = self._entries.get((*key, size), None)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end((*key, size))
+            return entry
+        self.misses += 1
+        font.configure(size=size)
+        entry = _FontMetrics(font.metrics('linespace'))
+        self._entries[(*key, size)] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def measure(self, font: Font, key: tuple[str, str, str], size: int,
+                text: str) -> int:
+        """Returns the width of a line of text in font at size."""
+        widths = self.get(font, key, size).widths
+        missing = set(text).difference(widths)
+        if missing:
+            font.configure(size=size)
+            for glyph in missing:
+                widths[glyph] = font.measure(glyph)
+        return sum(map(widths.__getitem__, text))
+
+    def word_width(self, font: Font, key: tuple[str, str, str], size: int,
+                   word: str) -> int:
+        """Like measure, but remembers the width of the word."""
+        word_widths = self.get(font, key, size).word_widths
+        width = word_widths.get(word, None)
+        if width is None:
+            width = self.measure(font, key, size, word)
+            if len(word_widths) >= 4096:
+                word_widths.clear()
+            word_widths[word] = width
+        return width
+
+    def text_width(self, font: Font, key: tuple[str, str, str], size: int,
+                   text: str) -> int:
+        """
+        Returns the width of a line of text in font at size as measured
+        by Tk, and remembers it.
+        """
+        text_widths = self.get(font, key, size).text_widths
+        width = text_widths.get(text, None)
+        if width is None:
+            font.configure(size=size)
+            width = font.measure(text)
+            if len(text_widths) >= 4096:
+                text_widths.clear()
+            text_widths[text] = width
+        return width
+
+    def clear(self) -> None:
+        """Removes all metrics from the cache."""
+        self._entries.clear()
+
+
+_font_metrics: _FontMetricsCache = _FontMetricsCache()
+
+
+class _MeasuredFont:
+    """
+    Measures a font at different sizes through the process-wide cache of
+    font metrics, so that repeated measurements need no calls into Tk.
+    """
+
+    def __init__(self, font: Font):
+        self.font: Font = font
+        self.key: tuple[str, str, str] = _font_pool.key(font)[:3]
+
+    def linespace(self, size: int) -> int:
+        return _font_metrics.get(self.font, self.key, size).linespace
+
+    def measure(self, size: int, text: str) -> int:
+        return _font_metrics.measure(self.font, self.key, size, text)
+
+    def word_width(self, size: int, word: str) -> int:
+        return _font_metrics.word_width(self.font, self.key, size, word)
+
+    def text_width(self, size: int, text: str) -> int:
+        return _font_metrics.text_width(self.font, self.key, size, text)
+
+
+def _fontsize_fit_height(max_height: float, font: _MeasuredFont,
                          min_value: int) -> int:
     """
     Find the largest font size that fits within the given height.
     """
     def get_height(fontsize: int) -> float:
-        font.configure(size=fontsize)
-        return font.metrics("linespace")
-    return _binary_search_maximize_int_outcome_below(max_height, get_height,
-                                                     min_value)
+        return font.linespace(fontsize)
+    return _estimate_maximize_int_outcome_below(max_height, get_height,
+                                                min_value)
 
-def _fontsize_fit_width(max_width: float, font: Font, text: str,
+def _fontsize_fit_width(max_width: float, font: _MeasuredFont, text: str,
                         min_value: int) -> int:
     """
     Find the largest font size that fits within the given width
     for the given text. The text is assumed to be a single line.
     """
     def get_width(fontsize: int) -> float:
-        font.configure(size=fontsize)
-        return font.measure(text)
-    return _binary_search_maximize_int_outcome_below(max_width, get_width,
-                                                     min_value)
+        return font.measure(fontsize, text)
+    fontsize = _estimate_maximize_int_outcome_below(max_width, get_width,
+                                                    min_value)
+    # The size is found from the widths of the glyphs, which may add up
+    # to a little less than the width of the text as drawn
+    while fontsize > min_value and font.text_width(fontsize, text) > max_width:
+        fontsize -= 1
+    return fontsize
+
+# The font size measured to estimate the font size which fits; the same
+# size is used every time, so that its metrics are usually cached
+_REFERENCE_FONT_SIZE = 64
+
+def _estimate_maximize_int_outcome_below(threshold: float,
+                             measure: Callable[[int], float],
+                             min_value: int=0) -> int:
+    """
+    Find the largest integer value that is less than or equal to the
+    threshold for the given measure function, like
+    _binary_search_maximize_int_outcome_below, but with fewer calls to
+    the measure function when it is nearly proportional to its argument
+    (as the width and height of text are to the font size).
+
+    The value is estimated from the outcome at _REFERENCE_FONT_SIZE, and
+    the neighbouring values are measured to confirm it. If the estimate
+    is off by more than one, it is estimated once more from the outcome
+    at the first estimate. If that fails too, the binary search takes
+    over, starting from the values measured so far.
+    """
+    outcomes: dict[int, float] = {}
+    def measure_once(value: int) -> float:
+        if value not in outcomes:
+            outcomes[value] = measure(value)
+        return outcomes[value]
+
+    estimate_from = _REFERENCE_FONT_SIZE
+    for _ in range(2):
+        outcome = measure_once(estimate_from)
+        if outcome <= 0:
+            break
+        estimate = max(min_value, int(threshold / outcome * estimate_from))
+        if estimate == min_value or measure_once(estimate) <= threshold:
+            if measure_once(estimate + 1) > threshold:
+                return estimate
+            if measure_once(estimate + 2) > threshold:
+                return estimate + 1
+        elif estimate - 1 == min_value or measure_once(estimate - 1) <= threshold:
+            return estimate - 1
+        estimate_from = estimate
+
+    below = [value for value, outcome in outcomes.items()
+             if value >= min_value and outcome <= threshold]
+    above = [value for value, outcome in outcomes.items()
+             if value > min_value and outcome > threshold]
+    lo = max(below, default=min_value)
+    if above:
+        return _binary_search(lambda x: measure_once(x) <= threshold,
+                              min(above), lo)
+    return _binary_search_maximize_int_outcome_below(threshold, measure_once,
+                                                     lo)
 
 def _binary_search_maximize_int_outcome_below(threshold: float,
                              measure: Callable[[int], float],
@@ -0,0 +1,38 @@
+import os
+
+from .display_list import TclDisplayList
+
+
+def __getattr__(name: str):
+    # The PIL based parts are imported on first use, since importing PIL
+    # is slow and not needed by apps which only draw in a Tk window
+    if name in ('PilCanvas', 'render_calls'):
+        from . import pil_canvas
+        return getattr(pil_canvas, name)
+    if name in ('PhotoImageCache', 'photoimage_cache'):
+        from . import image_cache
+        return getattr(image_cache, name)
+    if name in ('AnimationWriter', 'open_animation_writer'):
+        from . import animation
+        return getattr(animation, name)
+    if name == 'FrameRenderer':
+        from . import frame_renderer
+        return frame_renderer.FrameRenderer
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+BACKENDS = ('tk', 'pil')
+
+def get_backend(backend: str|None=None) -> str:
+    """
+    Returns the name of the render backend to use. If backend is None,
+    the RENDERBACKEND environment variable is used, and if that is not
+    set either, the default 'tk' backend is used.
+    """
+    if backend is None:
+        backend = os.environ.get('RENDERBACKEND', 'tk')
+    backend = backend.strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"render backend must be one of {BACKENDS},"
+                         + f" but got {repr(backend)}")
+    return backend
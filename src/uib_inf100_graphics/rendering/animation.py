@@ -0,0 +1,340 @@
+import io
+import os
+import struct
+import tempfile
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+from PIL import GifImagePlugin, Image, ImageChops
+
+
+class AnimationWriter(ABC):
+    """
+    An AnimationWriter saves a sequence of frames (PIL images, each
+    shown for a duration in milliseconds) to file. Frames are written
+    as they are added, so only a frame or two is ever kept in memory,
+    and the frames added so far are on disk even if the program never
+    gets to call close (except the last one for gif and png, which is
+    held back in case the next frame is identical to it).
+
+    Use open_animation_writer to get a writer for a given file name.
+    After close, frames_stored, size and encode_seconds tell how the
+    frames were stored, and summary describes it in a line of text.
+    """
+
+    def __init__(self, filename: str):
+        self.filename: str = filename
+        self.frames: int = 0
+        self.frames_stored: int = 0
+        self.size: int = 0
+        self.encode_seconds: float = 0.0
+
+    @abstractmethod
+    def add(self, image: Image.Image, duration_ms: int) -> None:
+        """Adds image as the next frame, shown for duration_ms."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Completes the file. No frames can be added afterwards."""
+
+    def summary(self) -> str:
+        """Returns a line such as 'ball.gif: 60 frames (12 stored), 48.6 kB in 0.21 s'."""
+        return (f'{self.filename}: {self.frames} frames ({self.frames_stored} stored),'
+                + f' {self.size / 1000:.1f} kB in {self.encode_seconds:.2f} s')
+
+
+def open_animation_writer(filename: str) -> AnimationWriter:
+    """
+    Returns an AnimationWriter for filename. The format is chosen by
+    the file extension: gif, png (animated png if there is more than
+    one frame), webp and tiff give a single (animated) file, while
+    other formats supported by PIL (such as jpg) give one file per
+    frame, numbered name_1.jpg, name_2.jpg and so on. A file name
+    without extension gets the png extension.
+    """
+    position_of_last_dot = filename.rfind('.')
+    if position_of_last_dot == -1:
+        root, extension = filename, 'png'
+    else:
+        root, extension = filename[:position_of_last_dot], filename[position_of_last_dot + 1:]
+    if not root:
+        root = 'screenshot'
+    kind = extension.lower()
+    if kind == 'gif':
+        return GifWriter(f'{root}.{extension}')
+    if kind == 'png':
+        return ApngWriter(f'{root}.{extension}')
+    if kind in ('webp', 'tiff'):
+        # TIFF has no frame durations, so every frame is stored
+        return _TranscodingWriter(f'{root}.{extension}',
+                                  merge_identical_frames=(kind == 'webp'))
+    return _ImageSequenceWriter(root, extension)
+
+
+class _DifferencingWriter(AnimationWriter):
+    # Base class for formats where a frame may update only part of the
+    # picture. Each frame is compared with the one before it: frames
+    # identical to the previous one are merged into it by adding up
+    # their durations, and otherwise only the bounding box of the
+    # pixels which changed is passed on to _write_frame. The latest
+    # frame is held back until it is known whether the next one merges
+    # into it. Unless merge_identical_frames, identical frames are kept
+    # as frames which update a single pixel
+    def __init__(self, filename: str, merge_identical_frames: bool=True):
+        super().__init__(filename)
+        self._merge_identical_frames: bool = merge_identical_frames
+        self._pending: Image.Image|None = None
+        self._pending_box: tuple[int, int, int, int] = (0, 0, 0, 0)
+        self._pending_duration_ms: int = 0
+
+    def add(self, image: Image.Image, duration_ms: int) -> None:
+        start = time.perf_counter()
+        image = image.convert('RGB')
+        self.frames += 1
+        if self._pending is None:
+            box = (0, 0, image.width, image.height)
+        else:
+            box = ImageChops.difference(self._pending, image).getbbox()
+            if box is None and not self._merge_identical_frames:
+                box = (0, 0, 1, 1)
+            if box is None:
+                self._pending_duration_ms += duration_ms
+                self.encode_seconds += time.perf_counter() - start
+                return
+            self._write_frame(self._pending, self._pending_box, self._pending_duration_ms)
+            self.frames_stored += 1
+        self._pending = image
+        self._pending_box = box
+        self._pending_duration_ms = duration_ms
+        self.encode_seconds += time.perf_counter() - start
+
+    def close(self) -> None:
+        start = time.perf_counter()
+        if self._pending is not None:
+            self._write_last_frame(self._pending, self._pending_box, self._pending_duration_ms)
+            self.frames_stored += 1
+            self._pending = None
+            self.size = os.path.getsize(self.filename)
+        self.encode_seconds += time.perf_counter() - start
+
+    @abstractmethod
+    def _write_frame(self, image: Image.Image, box: tuple[int, int, int, int],
+                     duration_ms: int) -> None:
+        # Writes the part of image inside box, shown for duration_ms
+        ...
+
+    @abstractmethod
+    def _write_last_frame(self, image: Image.Image, box: tuple[int, int, int, int],
+                          duration_ms: int) -> None:
+        # Like _write_frame, and then completes the file
+        ...
+
+
+class GifWriter(_DifferencingWriter):
+    """
+    Writes frames to an animated GIF file which loops forever. All
+    frames share one palette of 256 colors (the global color table of
+    the file): colors are added to it as they first appear, and once it
+    is full, new colors are drawn with the closest color in it. Frames
+    with more than 256 colors of their own are reduced to 256 first.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self._file: BinaryIO|None = None
+        self._palette: dict[tuple[int, ...], int] = {}
+        self._closest: dict[tuple[int, ...], int] = {}
+        self._palette_position: int = 0
+
+    def _write_frame(self, image: Image.Image, box: tuple[int, int, int, int],
+                     duration_ms: int) -> None:
+        if self._file is None:
+            self._file = open(self.filename, 'wb')
+            self._file.write(b'GIF89a' + struct.pack('<HHBBB', image.width, image.height,
+                                                     0xF7, 0, 0))
+            self._palette_position = self._file.tell()
+            self._file.write(bytes(768))
+            self._file.write(b'!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00') # loop forever
+        frame = image.crop(box).convert('P', palette=Image.Palette.ADAPTIVE)
+        palette_size = len(self._palette)
+        frame = frame.point(self._palette_lookup(frame))
+        if len(self._palette) != palette_size:
+            self._file.seek(self._palette_position)
+            self._file.write(b''.join(bytes(color) for color in self._palette))
+            self._file.seek(0, os.SEEK_END)
+        # Disposal 1 leaves the frame in place, to be drawn over by the
+        # next (partial) frame
+        data = GifImagePlugin.getdata(frame, offset=box[:2], duration=duration_ms,
+                                      disposal=1)
+        self._file.write(b''.join(data))
+        self._file.flush()
+
+    def _write_last_frame(self, image: Image.Image, box: tuple[int, int, int, int],
+                          duration_ms: int) -> None:
+        self._write_frame(image, box, duration_ms)
+        assert self._file is not None
+        self._file.write(b';') # trailer
+        self._file.close()
+        self._file = None
+
+    def _palette_lookup(self, frame: Image.Image) -> list[int]:
+        # Maps the indexes of the frame's own palette to the shared one
+        colors = frame.getpalette() or []
+        lookup = list(range(256))
+        for index, count in enumerate(frame.histogram()):
+            if count:
+                lookup[index] = self._palette_index(tuple(colors[3 * index:3 * index + 3]))
+        return lookup
+
+    def _palette_index(self, color: tuple[int, ...]) -> int:
+        if color in self._palette:
+            return self._palette[color]
+        if len(self._palette) < 256:
+            self._palette[color] = len(self._palette)
+            return self._palette[color]
+        if color not in self._closest:
+            self._closest[color] = min(self._palette.items(), key=lambda item: sum(
+                    (a - b) ** 2 for a, b in zip(item[0], color)))[1]
+        return self._closest[color]
+
+
+class ApngWriter(_DifferencingWriter):
+    """
+    Writes frames to an animated PNG file which loops forever. If all
+    frames are identical, an ordinary PNG file is written. The frames
+    are compressed by PIL's PNG encoder; this class only arranges its
+    output as APNG chunks.
+
+    Frames identical to the one before are merged into it, unless
+    merge_identical_frames is False; then every frame is stored, and
+    durations has one entry per frame added.
+    """
+
+    def __init__(self, filename: str, merge_identical_frames: bool=True):
+        super().__init__(filename, merge_identical_frames)
+        self.durations: list[int] = []
+        self._file: BinaryIO|None = None
+        self._sequence_number: int = 0
+        self._actl_position: int = 0
+
+    def _write_frame(self, image: Image.Image, box: tuple[int, int, int, int],
+                     duration_ms: int) -> None:
+        if self._file is None:
+            self._file = open(self.filename, 'wb')
+            chunks = _png_chunks(image)
+            self._file.write(_PNG_SIGNATURE)
+            self._write_chunk(b'IHDR', chunks[b'IHDR'][0])
+            self._actl_position = self._file.tell()
+            self._write_chunk(b'acTL', struct.pack('>II', 1, 0))
+            self._write_frame_control(box, duration_ms)
+            for part in chunks[b'IDAT']:
+                self._write_chunk(b'IDAT', part)
+        else:
+            self._write_frame_control(box, duration_ms)
+            for part in _png_chunks(image.crop(box))[b'IDAT']:
+                self._write_chunk(b'fdAT', struct.pack('>I', self._next_sequence_number()) + part)
+        self.durations.append(duration_ms)
+        # Keep the frame count up to date, so the file is usable as is
+        self._file.seek(self._actl_position)
+        self._write_chunk(b'acTL', struct.pack('>II', len(self.durations), 0))
+        self._file.seek(0, os.SEEK_END)
+        self._file.flush()
+
+    def _write_last_frame(self, image: Image.Image, box: tuple[int, int, int, int],
+                          duration_ms: int) -> None:
+        if self._file is None:
+            image.save(self.filename)
+            self.durations.append(duration_ms)
+            return
+        self._write_frame(image, box, duration_ms)
+        self._write_chunk(b'IEND', b'')
+        self._file.close()
+        self._file = None
+
+    def _write_frame_control(self, box: tuple[int, int, int, int], duration_ms: int) -> None:
+        # The delay is a fraction; long (merged) delays use a coarser
+        # denominator to fit in 16 bits
+        numerator, denominator = max(0, duration_ms), 1000
+        while numerator > 0xFFFF and denominator > 1:
+            numerator, denominator = numerator // 10, denominator // 10
+        self._write_chunk(b'fcTL', struct.pack(
+                '>IIIIIHHBB', self._next_sequence_number(),
+                box[2] - box[0], box[3] - box[1], box[0], box[1],
+                min(numerator, 0xFFFF), denominator, 0, 0))
+
+    def _next_sequence_number(self) -> int:
+        self._sequence_number += 1
+        return self._sequence_number - 1
+
+    def _write_chunk(self, kind: bytes, data: bytes) -> None:
+        assert self._file is not None
+        self._file.write(struct.pack('>I', len(data)) + kind + data
+                         + struct.pack('>I', zlib.crc32(kind + data)))
+
+
+class _TranscodingWriter(AnimationWriter):
+    # Formats without a streaming encoder in PIL (webp, tiff) are
+    # written to a temporary animated png as the frames arrive, and
+    # converted when the writer is closed; PIL then reads the temporary
+    # file one frame at a time. Formats which cannot store how long each
+    # frame is shown need every frame in the temporary file
+    def __init__(self, filename: str, merge_identical_frames: bool=True):
+        super().__init__(filename)
+        handle, temporary_filename = tempfile.mkstemp(suffix='.png')
+        os.close(handle)
+        self._png: ApngWriter = ApngWriter(temporary_filename, merge_identical_frames)
+
+    def add(self, image: Image.Image, duration_ms: int) -> None:
+        self._png.add(image, duration_ms)
+        self.frames += 1
+
+    def close(self) -> None:
+        if self.frames and os.path.exists(self._png.filename):
+            self._png.close()
+            start = time.perf_counter()
+            with Image.open(self._png.filename) as frames:
+                frames.save(self.filename, save_all=True,
+                            duration=self._png.durations, loop=0)
+            self.frames_stored = self._png.frames_stored
+            self.size = os.path.getsize(self.filename)
+            self.encode_seconds = self._png.encode_seconds + time.perf_counter() - start
+        if os.path.exists(self._png.filename):
+            os.remove(self._png.filename)
+
+
+class _ImageSequenceWriter(AnimationWriter):
+    # One file per frame, for formats without animation
+    def __init__(self, root: str, extension: str):
+        super().__init__(f'{root}.{extension}')
+        self._root: str = root
+        self._extension: str = extension
+
+    def add(self, image: Image.Image, duration_ms: int) -> None:
+        start = time.perf_counter()
+        self.frames += 1
+        filename = f'{self._root}_{self.frames}.{self._extension}'
+        image.save(filename)
+        self.frames_stored += 1
+        self.size += os.path.getsize(filename)
+        self.encode_seconds += time.perf_counter() - start
+
+    def close(self) -> None:
+        pass
+
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def _png_chunks(image: Image.Image) -> dict[bytes, list[bytes]]:
+    # Encodes image as PNG, and returns the data of its chunks by type
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    png = buffer.getvalue()
+    chunks: dict[bytes, list[bytes]] = {}
+    position = len(_PNG_SIGNATURE)
+    while position < len(png):
+        length, kind = struct.unpack('>I4s', png[position:position + 8])
+        chunks.setdefault(kind, []).append(png[position + 8:position + 8 + length])
+        position += 12 + length
+    return chunks
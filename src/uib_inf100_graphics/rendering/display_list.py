@@ -0,0 +1,162 @@
+from tkinter import TclError, _flatten
+from typing import Any
+
+
+# Runs a list of canvas commands (each a list of words, such as
+# {create rectangle 10 10 50 50 -fill red}) in one call from Python.
+# Returns the id of the last item created; if a command fails, its
+# index is left in failed before the error is passed on.
+_DRAW_PROC = '''
+namespace eval ::uib_inf100_graphics {}
+proc ::uib_inf100_graphics::draw {canvas commands} {
+    variable failed -1
+    set last {}
+    set index 0
+    foreach command $commands {
+        if {[catch {$canvas {*}$command} result]} {
+            set failed $index
+            return -code error $result
+        }
+        if {[lindex $command 0] eq "create"} {
+            set last $result
+        }
+        incr index
+    }
+    return $last
+}
+'''
+
+
+class TclDisplayList:
+    """
+    A TclDisplayList collects commands for the items of a tkinter Canvas
+    (create, coords, itemconfigure, delete, raise and lower), and runs
+    them with one call into Tcl per chunk of chunk_size commands when
+    flush is called. Drawing a frame with thousands of items then costs
+    a handful of round trips between Python and Tcl instead of one (with
+    option conversion) per item.
+
+    Ids of created items are not known before the commands are run, so
+    the create method does not return them. Tk gives the items of a
+    canvas consecutive ids, so a caller which needs them can count them,
+    and compare with the id of the last item created returned by flush.
+
+    If a command fails, the commands before it have taken effect and
+    the rest are discarded. The TclError raised names the canvas call
+    which the failing command came from, both in its message and in its
+    canvas_call attribute (as the call is no longer on the stack).
+    """
+
+    def __init__(self, canvas: Any, chunk_size: int=5000):
+        self.chunk_size: int = chunk_size
+        self._canvas: Any = canvas
+        self._commands: list[list[Any]] = []
+        self._calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+        self._has_draw_proc: bool = False
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def create(self, method_name: str, args: tuple[Any, ...],
+               kwargs: dict[str, Any]) -> None:
+        """Adds a call such as create_rectangle(10, 10, 50, 50, fill='red')."""
+        coords = _flatten(args)
+        options = kwargs
+        if coords and isinstance(coords[-1], dict):
+            options = {**coords[-1], **kwargs}
+            coords = coords[:-1]
+        command = ['create', method_name[len('create_'):], *coords]
+        self._add_options(command, options)
+        self._commands.append(command)
+        self._calls.append((method_name, args, kwargs))
+
+    def coords(self, item_id: int, coords: tuple[Any, ...],
+               source: tuple[str, tuple[Any, ...], dict[str, Any]]|None=None) -> None:
+        """
+        Adds a call to coords, moving an item. If the item is updated on
+        behalf of another canvas call, such as a create_ -call, that
+        call (method_name, args, kwargs) may be given as source, and is
+        then named in error messages.
+        """
+        self._commands.append(['coords', item_id, *_flatten(coords)])
+        self._calls.append(source or ('coords', (item_id, *coords), {}))
+
+    def itemconfigure(self, item_id: int, options: dict[str, Any],
+                      source: tuple[str, tuple[Any, ...], dict[str, Any]]|None=None) -> None:
+        """
+        Adds a call to itemconfigure, changing options of an item. The
+        source parameter is used like for coords.
+        """
+        command = ['itemconfigure', item_id]
+        self._add_options(command, options)
+        self._commands.append(command)
+        self._calls.append(source or ('itemconfigure', (item_id,), options))
+
+    def delete(self, *item_ids: int|str) -> None:
+        """Adds a call to delete, with item ids or tags such as "all"."""
+        self._commands.append(['delete', *item_ids])
+        self._calls.append(('delete', item_ids, {}))
+
+    def tag_raise(self, item_id: int, above_id: int) -> None:
+        """Adds a call to tag_raise, placing an item just above another."""
+        self._commands.append(['raise', item_id, above_id])
+        self._calls.append(('tag_raise', (item_id, above_id), {}))
+
+    def tag_lower(self, item_id: int) -> None:
+        """Adds a call to tag_lower, placing an item at the bottom."""
+        self._commands.append(['lower', item_id])
+        self._calls.append(('tag_lower', (item_id,), {}))
+
+    def clear(self) -> None:
+        """Discards the commands which have not been run."""
+        self._commands.clear()
+        self._calls.clear()
+
+    def flush(self) -> int|None:
+        """
+        Runs the commands collected so far, and returns the id of the
+        last item created (or None if no item was created).
+        """
+        if not self._commands:
+            return None
+        commands, calls = self._commands, self._calls
+        self._commands, self._calls = [], []
+        tk = self._canvas.tk
+        if not self._has_draw_proc:
+            tk.eval(_DRAW_PROC)
+            self._has_draw_proc = True
+        last_id = None
+        for start in range(0, len(commands), self.chunk_size):
+            try:
+                result = tk.call('::uib_inf100_graphics::draw', self._canvas._w,
+                                 commands[start:start + self.chunk_size])
+            except TclError as e:
+                index = start + tk.getint(tk.globalgetvar('::uib_inf100_graphics::failed'))
+                call = _describe(*calls[index])
+                error = TclError(f'{call}: {e}')
+                error.canvas_call = call
+                raise error from None
+            if result != '':
+                last_id = tk.getint(result)
+        return last_id
+
+    def _add_options(self, command: list[Any], options: dict[str, Any]) -> None:
+        # Mirrors tkinter.Misc._options: None values are left out, a
+        # trailing _ is removed from the name, and functions are
+        # registered as Tcl commands. Other values (including tuples,
+        # which become Tcl lists) are converted by tkinter as usual
+        for key, value in options.items():
+            if value is None:
+                continue
+            if key[-1] == '_':
+                key = key[:-1]
+            if callable(value):
+                value = self._canvas._register(value)
+            command.append('-' + key)
+            command.append(value)
+
+
+def _describe(method_name: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    arguments = [repr(arg) for arg in args]
+    arguments += [f'{key}={repr(value)}' for key, value in kwargs.items()]
+    return f'canvas.{method_name}({", ".join(arguments)})'
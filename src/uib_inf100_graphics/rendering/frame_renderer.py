@@ -0,0 +1,119 @@
+import collections
+import multiprocessing
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from tkinter.font import Font
+from typing import Any
+
+from PIL import Image
+
+from .animation import AnimationWriter
+from .pil_canvas import render_calls
+
+
+class FrameRenderer:
+    """
+    A FrameRenderer rasterizes frames given as recorded drawing calls
+    (method_name, args, kwargs), and adds them to an AnimationWriter in
+    the order they were given.
+
+    With workers > 0, the frames are rasterized by that many worker
+    processes while the program goes on preparing the next frames, and
+    at most two frames per worker are in progress at any time. The
+    calls are pickled as they are added, so the program may go on to
+    change the lists and objects in them; a frame whose calls cannot be
+    pickled is rasterized in the calling process. Worker
+    processes are started with fork, so that the program is not run
+    again in them; where fork is not available (such as on Windows),
+    or if a worker fails for any reason, the remaining frames are
+    rasterized in the calling process instead. With workers=0, every
+    frame is rasterized in the calling process as it is added.
+    """
+
+    def __init__(self, writer: AnimationWriter, width: int, height: int,
+                 workers: int=0):
+        self.writer: AnimationWriter = writer
+        self.width: int = width
+        self.height: int = height
+        self.workers: int = 0
+        self._pool: ProcessPoolExecutor|None = None
+        self._in_progress: collections.deque[tuple[Future[Image.Image], bytes, int]] = collections.deque()
+        if workers > 0 and 'fork' in multiprocessing.get_all_start_methods():
+            try:
+                self._pool = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context('fork'))
+                self.workers = workers
+            except (OSError, ValueError):
+                self._pool = None
+
+    def add(self, calls: list[Any], duration_ms: int) -> None:
+        """Adds the frame drawn by calls, shown for duration_ms."""
+        if self._pool is not None and self._submit(calls, duration_ms):
+            # Frames are handed to the writer as soon as they (and all
+            # frames before them) are done
+            while self._in_progress and (self._in_progress[0][0].done()
+                                         or len(self._in_progress) > 2 * self.workers):
+                self._finish(1)
+            return
+        self._finish(len(self._in_progress))
+        self.writer.add(render_calls(calls, self.width, self.height), duration_ms)
+
+    def close(self) -> None:
+        """Waits for all frames to be rasterized, and closes the writer."""
+        self._finish(len(self._in_progress))
+        self._stop_pool()
+        self.writer.close()
+
+    def _submit(self, calls: list[Any], duration_ms: int) -> bool:
+        # Hands the frame to a worker process, or returns False if it
+        # cannot be sent to one
+        assert self._pool is not None
+        try:
+            data = pickle.dumps(_picklable_calls(calls))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        try:
+            future = self._pool.submit(_render_pickled_calls, data, self.width, self.height)
+        except RuntimeError:
+            self._stop_pool()
+            return False
+        self._in_progress.append((future, data, duration_ms))
+        return True
+
+    def _finish(self, count: int) -> None:
+        # Passes the first count frames in progress on to the writer, in
+        # order. A frame which failed in a worker process is rasterized
+        # here instead, so that errors in the drawing calls are raised
+        # as usual
+        for _ in range(count):
+            future, data, duration_ms = self._in_progress.popleft()
+            try:
+                image = future.result()
+            except Exception:
+                self._stop_pool()
+                image = _render_pickled_calls(data, self.width, self.height)
+            self.writer.add(image, duration_ms)
+
+    def _stop_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _picklable_calls(calls: list[Any]) -> list[Any]:
+    # Fonts belong to a Tcl interpreter, and are passed on as the
+    # (family, size, weight, slant) they resolve to instead
+    result = []
+    for method_name, args, kwargs in calls:
+        font = kwargs.get('font', None)
+        if isinstance(font, Font):
+            actual = font.actual()
+            kwargs = {**kwargs, 'font': (actual['family'], actual['size'],
+                                         actual['weight'], actual['slant'])}
+        result.append((method_name, args, kwargs))
+    return result
+
+
+def _render_pickled_calls(data: bytes, width: int, height: int) -> Image.Image:
+    return render_calls(pickle.loads(data), width, height)
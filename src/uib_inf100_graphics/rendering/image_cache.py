@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Any
+
+from PIL import Image, ImageTk
+
+
+class PhotoImageCache:
+    """
+    A PhotoImageCache converts PIL images to tkinter PhotoImage objects,
+    and remembers the conversions so that an image which is drawn again
+    (for example a sprite drawn in every frame) is not converted again.
+
+    Images are looked up by their content, so an image which has been
+    changed in place is converted anew (palette images also when their
+    palette or transparent color changes). Looking up an image costs about
+    as much as a copy of its pixel data (it is hashed from tobytes()),
+    which is still far less than converting it.
+
+    The cache holds at most max_bytes worth of images (counting 4 bytes
+    per pixel); the least recently used images are released first.
+    When the last Python reference to a PhotoImage goes away, Tk deletes
+    the image, and canvas items showing it turn blank; Tk does not keep
+    the image alive for them. A canvas must therefore keep references to
+    the PhotoImages it shows itself, and not rely on the cache for it.
+    """
+
+    def __init__(self, max_bytes: int=64 * 1024 * 1024):
+        self.max_bytes: int = max_bytes
+        self._entries: OrderedDict[Any, tuple[ImageTk.PhotoImage, int]] = OrderedDict()
+        self._bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @staticmethod
+    def _key(pil_image: Image.Image) -> Any:
+        # The pixels of a palette image are indexes, so its colors are
+        # given by the palette and the transparent index as well
+        palette = pil_image.getpalette() if pil_image.mode in ('P', 'PA') else None
+        return (pil_image.mode, pil_image.size, hash(pil_image.tobytes()),
+                None if palette is None else tuple(palette),
+                pil_image.info.get('transparency', None))
+
+    def get(self, pil_image: Image.Image) -> ImageTk.PhotoImage:
+        """Returns a PhotoImage with the same content as pil_image."""
+        key = self._key(pil_image)
+        entry = self._entries.get(key, None)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        photoimage = ImageTk.PhotoImage(pil_image)
+        size = 4 * pil_image.width * pil_image.height
+        self._entries[key] = (photoimage, size)
+        self._bytes += size
+        self._evict(self.max_bytes)
+        return photoimage
+
+    def release(self, pil_image: Image.Image) -> None:
+        """Removes the conversion of pil_image from the cache, if any."""
+        entry = self._entries.pop(self._key(pil_image), None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Removes all conversions from the cache."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _evict(self, max_bytes: int) -> None:
+        # The newest entry is kept even if it alone exceeds the budget
+        while self._bytes > max_bytes and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        """Returns counters describing the use of the cache."""
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Shared by the event_app and simple canvases
+photoimage_cache = PhotoImageCache()
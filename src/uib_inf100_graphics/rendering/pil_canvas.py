@@ -0,0 +1,360 @@
+import functools
+import re
+from tkinter import _flatten
+from typing import Any
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+
+class PilCanvas:
+    """
+    A PilCanvas object mimics the item-based interface of a tkinter
+    Canvas (create_ -methods returning ids, coords, itemconfigure,
+    delete, move, tag_raise, ...), but keeps the items in memory and
+    rasterizes them with PIL.ImageDraw instead of showing them on
+    screen. It does not need a Tk root nor a display.
+
+    The rasterized content is available with the get_image method.
+    Bitmap and window items are accepted, but are not drawn.
+    """
+
+    def __init__(self, master: Any=None, width: int=400, height: int=400,
+                 background: str='white', **kwargs: Any):
+        self._width: int = int(width)
+        self._height: int = int(height)
+        self._background: str = kwargs.get('bg', background)
+        self._items: dict[int, list[Any]] = {} # id -> [kind, coords, options]
+        self._order: list[int] = []            # stacking order, bottom first
+        self._next_id: int = 1
+
+    def get_image(self) -> Image.Image:
+        """Returns a new RGB image with the current content of the canvas."""
+        image = Image.new('RGB', (self._width, self._height),
+                          _color(self._background) or 'white')
+        draw = ImageDraw.Draw(image)
+        for item_id in self._order:
+            kind, coords, options = self._items[item_id]
+            _DRAW_FUNCTIONS[kind](image, draw, coords, options)
+        return image
+
+    def _create(self, kind: str, args: tuple[Any, ...],
+                kwargs: dict[str, Any]) -> int:
+        args = _flatten(args)
+        options = {}
+        if args and isinstance(args[-1], dict):
+            options.update(args[-1])
+            args = args[:-1]
+        options.update(kwargs)
+        item_id = self._next_id
+        self._next_id += 1
+        self._items[item_id] = [kind, [float(v) for v in args], options]
+        self._order.append(item_id)
+        return item_id
+
+    def create_arc(self, *args: Any, **kwargs: Any) -> int: return self._create('arc', args, kwargs)
+    def create_bitmap(self, *args: Any, **kwargs: Any) -> int: return self._create('bitmap', args, kwargs)
+    def create_image(self, *args: Any, **kwargs: Any) -> int: return self._create('image', args, kwargs)
+    def create_line(self, *args: Any, **kwargs: Any) -> int: return self._create('line', args, kwargs)
+    def create_oval(self, *args: Any, **kwargs: Any) -> int: return self._create('oval', args, kwargs)
+    def create_polygon(self, *args: Any, **kwargs: Any) -> int: return self._create('polygon', args, kwargs)
+    def create_rectangle(self, *args: Any, **kwargs: Any) -> int: return self._create('rectangle', args, kwargs)
+    def create_text(self, *args: Any, **kwargs: Any) -> int: return self._create('text', args, kwargs)
+    def create_window(self, *args: Any, **kwargs: Any) -> int: return self._create('window', args, kwargs)
+
+    def _find(self, tagOrId: Any) -> list[int]:
+        if isinstance(tagOrId, int) or (isinstance(tagOrId, str) and tagOrId.isdigit()):
+            return [int(tagOrId)] if int(tagOrId) in self._items else []
+        if tagOrId == 'all':
+            return list(self._order)
+        return [item_id for item_id in self._order
+                if tagOrId in _tags(self._items[item_id][2])]
+
+    def find_all(self) -> tuple[int, ...]:
+        return tuple(self._order)
+
+    def type(self, tagOrId: Any) -> str|None:
+        found = self._find(tagOrId)
+        return self._items[found[0]][0] if found else None
+
+    def coords(self, tagOrId: Any, *args: Any) -> list[float]:
+        found = self._find(tagOrId)
+        if not found:
+            return []
+        if args:
+            self._items[found[0]][1] = [float(v) for v in _flatten(args)]
+        return list(self._items[found[0]][1])
+
+    def itemcget(self, tagOrId: Any, option: str) -> Any:
+        found = self._find(tagOrId)
+        return self._items[found[0]][2].get(option, '') if found else ''
+
+    def itemconfigure(self, tagOrId: Any, cnf: dict[str, Any]|None=None,
+                      **kwargs: Any) -> dict[str, Any]|None:
+        found = self._find(tagOrId)
+        if not (cnf or kwargs):
+            return dict(self._items[found[0]][2]) if found else None
+        for item_id in found:
+            self._items[item_id][2].update(cnf or {}, **kwargs)
+        return None
+    itemconfig = itemconfigure
+
+    def delete(self, *args: Any) -> None:
+        for tagOrId in args:
+            for item_id in self._find(tagOrId):
+                del self._items[item_id]
+                self._order.remove(item_id)
+
+    def move(self, tagOrId: Any, xAmount: float, yAmount: float) -> None:
+        for item_id in self._find(tagOrId):
+            coords = self._items[item_id][1]
+            for i in range(len(coords)):
+                coords[i] += xAmount if i % 2 == 0 else yAmount
+
+    def moveto(self, tagOrId: Any, x: float|str='', y: float|str='') -> None:
+        for item_id in self._find(tagOrId):
+            coords = self._items[item_id][1]
+            dx = 0 if x == '' else float(x) - min(coords[0::2])
+            dy = 0 if y == '' else float(y) - min(coords[1::2])
+            self.move(item_id, dx, dy)
+
+    def tag_raise(self, tagOrId: Any, aboveThis: Any=None) -> None:
+        found = self._find(tagOrId)
+        for item_id in found:
+            self._order.remove(item_id)
+        if aboveThis is None:
+            self._order.extend(found)
+        else:
+            above = self._find(aboveThis)
+            index = self._order.index(above[-1]) + 1 if above else len(self._order)
+            self._order[index:index] = found
+    lift = tkraise = tag_raise
+
+    def tag_lower(self, tagOrId: Any, belowThis: Any=None) -> None:
+        found = self._find(tagOrId)
+        for item_id in found:
+            self._order.remove(item_id)
+        below = self._find(belowThis) if belowThis is not None else []
+        index = self._order.index(below[0]) if below else 0
+        self._order[index:index] = found
+    lower = tag_lower
+
+    def winfo_width(self) -> int: return self._width
+    def winfo_height(self) -> int: return self._height
+    def update(self) -> None: pass
+    def update_idletasks(self) -> None: pass
+    def pack(self, *args: Any, **kwargs: Any) -> None: pass
+    def destroy(self) -> None: self.delete('all')
+
+
+def render_calls(calls: Any, width: int, height: int,
+                 background: str='white') -> Image.Image:
+    """
+    Rasterizes a sequence of (method_name, args, kwargs) drawing calls,
+    such as WrappedCanvas.logged_drawing_calls, into a new RGB image.
+    """
+    canvas = PilCanvas(width=width, height=height, background=background)
+    for method_name, args, kwargs in calls:
+        getattr(canvas, method_name)(*args, **kwargs)
+    return canvas.get_image()
+
+
+def _tags(options: dict[str, Any]) -> tuple[str, ...]:
+    tags = options.get('tags', options.get('tag', ()))
+    return tuple(tags.split()) if isinstance(tags, str) else tuple(tags)
+
+@functools.lru_cache(maxsize=256)
+def _color(color: Any) -> str|tuple[int, int, int]|None:
+    """Converts a Tk color to a PIL color, or None for transparent."""
+    if (color is None) or (color == ''):
+        return None
+    if not isinstance(color, str):
+        return color
+    for candidate in (color, color.replace(' ', '').lower()):
+        try:
+            return ImageColor.getrgb(candidate)
+        except ValueError:
+            pass
+    # Tk also knows gray0..gray100 and variants such as 'SteelBlue3'
+    match = re.fullmatch(r'(gr[ae]y)(\d+)', color.replace(' ', '').lower())
+    if match and int(match.group(2)) <= 100:
+        level = round(int(match.group(2)) * 255 / 100)
+        return (level, level, level)
+    match = re.fullmatch(r'(.*?)[1-4]', color.replace(' ', '').lower())
+    if match:
+        return _color(match.group(1))
+    return (0, 0, 0)
+
+def _width(options: dict[str, Any]) -> int:
+    return max(0, round(float(options.get('width', 1))))
+
+def _box(coords: list[float]) -> tuple[float, float, float, float]:
+    x1, y1, x2, y2 = coords[:4]
+    return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+def _draw_rectangle(image, draw, coords, options):
+    outline = _color(options.get('outline', 'black'))
+    width = _width(options) if outline is not None else 0
+    draw.rectangle(_box(coords), fill=_color(options.get('fill', '')),
+                   outline=outline if width else None, width=width)
+
+def _draw_oval(image, draw, coords, options):
+    outline = _color(options.get('outline', 'black'))
+    width = _width(options) if outline is not None else 0
+    draw.ellipse(_box(coords), fill=_color(options.get('fill', '')),
+                 outline=outline if width else None, width=width)
+
+def _draw_polygon(image, draw, coords, options):
+    if len(coords) < 4:
+        return
+    outline = _color(options.get('outline', ''))
+    width = _width(options) if outline is not None else 0
+    draw.polygon(coords, fill=_color(options.get('fill', 'black')),
+                 outline=outline if width else None, width=width)
+
+def _draw_line(image, draw, coords, options):
+    fill = _color(options.get('fill', 'black'))
+    if fill is None or len(coords) < 4:
+        return
+    width = max(1, _width(options))
+    draw.line(coords, fill=fill, width=width,
+              joint='curve' if width > 2 else None)
+
+def _draw_arc(image, draw, coords, options):
+    # Tk measures angles counter-clockwise, PIL measures them clockwise
+    start = float(options.get('start', 0))
+    extent = float(options.get('extent', 90))
+    if extent < 0:
+        start, extent = start + extent, -extent
+    pil_start, pil_end = -(start + extent), -start
+    style = options.get('style', 'pieslice')
+    outline = _color(options.get('outline', 'black'))
+    width = _width(options) if outline is not None else 0
+    box = _box(coords)
+    if style == 'arc':
+        if width:
+            draw.arc(box, pil_start, pil_end, fill=outline, width=width)
+    elif style == 'chord':
+        draw.chord(box, pil_start, pil_end, fill=_color(options.get('fill', '')),
+                   outline=outline if width else None, width=width)
+    else:
+        draw.pieslice(box, pil_start, pil_end, fill=_color(options.get('fill', '')),
+                      outline=outline if width else None, width=width)
+
+# Fraction of the width and height of an item which is left of and
+# above its anchor point
+_ANCHOR_OFFSETS = {
+    'nw': (0, 0), 'n': (0.5, 0), 'ne': (1, 0),
+    'w': (0, 0.5), 'center': (0.5, 0.5), 'e': (1, 0.5),
+    'sw': (0, 1), 's': (0.5, 1), 'se': (1, 1),
+}
+
+def _anchored(coords, size, options):
+    fx, fy = _ANCHOR_OFFSETS.get(str(options.get('anchor', 'center')), (0.5, 0.5))
+    return round(coords[0] - fx * size[0]), round(coords[1] - fy * size[1])
+
+def _draw_text(image, draw, coords, options):
+    text = str(options.get('text', ''))
+    fill = _color(options.get('fill', 'black'))
+    if not text or fill is None:
+        return
+    font = _pil_font(*_font_spec(options.get('font', None)))
+    justify = options.get('justify', 'left')
+    left, top, right, bottom = draw.multiline_textbbox((0, 0), text, font=font,
+                                                       align=justify)
+    x, y = _anchored(coords, (right - left, bottom - top), options)
+    angle = float(options.get('angle', 0))
+    if angle == 0:
+        draw.multiline_text((x - left, y - top), text, fill=fill, font=font,
+                            align=justify)
+        return
+    # Draw on a square layer centered at the anchor point, and rotate the
+    # layer (counter-clockwise, as in Tk) around its center
+    radius = int(((right - left)**2 + (bottom - top)**2)**0.5) + 1
+    cx, cy = round(coords[0]), round(coords[1])
+    layer = Image.new('RGBA', (2*radius, 2*radius), (0, 0, 0, 0))
+    ImageDraw.Draw(layer).multiline_text(
+            (x - left - cx + radius, y - top - cy + radius), text,
+            fill=fill, font=font, align=justify)
+    layer = layer.rotate(angle, resample=Image.BICUBIC)
+    image.paste(layer, (cx - radius, cy - radius), layer)
+
+def _draw_image(image, draw, coords, options):
+    pil_image = options.get('pil_image', None)
+    if pil_image is None:
+        pil_image = options.get('image', None)
+    if (pil_image is not None) and not isinstance(pil_image, Image.Image):
+        try:
+            from PIL import ImageTk
+            pil_image = ImageTk.getimage(pil_image)
+        except Exception:
+            return # a Tk image we have no way of reading
+    if pil_image is None:
+        return
+    position = _anchored(coords, pil_image.size, options)
+    if pil_image.mode in ('RGBA', 'LA') or 'transparency' in pil_image.info:
+        pil_image = pil_image.convert('RGBA')
+        image.paste(pil_image, position, pil_image)
+    else:
+        image.paste(pil_image.convert('RGB'), position)
+
+def _draw_nothing(image, draw, coords, options):
+    pass
+
+_DRAW_FUNCTIONS = {
+    'arc': _draw_arc,
+    'bitmap': _draw_nothing,
+    'image': _draw_image,
+    'line': _draw_line,
+    'oval': _draw_oval,
+    'polygon': _draw_polygon,
+    'rectangle': _draw_rectangle,
+    'text': _draw_text,
+    'window': _draw_nothing,
+}
+
+_DEFAULT_FONT_SIZE = 10
+
+def _font_spec(font: Any) -> tuple[str, int, bool, bool]:
+    """Converts a Tk font specification to (family, pixels, bold, italic)."""
+    family, size, styles = '', _DEFAULT_FONT_SIZE, []
+    if hasattr(font, 'actual'): # a tkinter.font.Font
+        actual = font.actual()
+        family, size = actual['family'], actual['size']
+        styles = [actual['weight'], actual['slant']]
+    elif isinstance(font, str):
+        parts = font.split()
+        size_index = next((i for i, part in enumerate(parts)
+                           if part.lstrip('-').isdigit()), None)
+        if size_index is None:
+            family = font
+        else:
+            family = ' '.join(parts[:size_index])
+            size = int(parts[size_index])
+            styles = parts[size_index + 1:]
+    elif isinstance(font, (tuple, list)) and len(font) > 0:
+        family = str(font[0])
+        if len(font) > 1:
+            size = int(font[1])
+        styles = [str(style) for style in font[2:]]
+    # Positive sizes are points, negative sizes are pixels (as in Tk)
+    pixels = -size if size < 0 else round(size * 4 / 3)
+    styles = [style.lower() for style in styles]
+    return family.strip('{}'), max(1, pixels), 'bold' in styles, 'italic' in styles
+
+@functools.lru_cache(maxsize=128)
+def _pil_font(family: str, pixels: int, bold: bool, italic: bool) -> Any:
+    suffix = ('Bold' if bold else '') + ('Oblique' if italic else '')
+    candidates = []
+    if family and not family.startswith('Tk'):
+        candidates += [f'{family} {suffix}'.strip(), family, family.lower().replace(' ', '')]
+    candidates += [f'DejaVuSans-{suffix}' if suffix else 'DejaVuSans',
+                   'arialbd' if bold else 'arial']
+    for candidate in candidates:
+        try:
+            return ImageFont.truetype(candidate, pixels)
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size=pixels)
+    except TypeError: # Pillow < 10.1 has only a fixed size default font
+        return ImageFont.load_default()
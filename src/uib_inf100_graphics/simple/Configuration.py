@@ -42,13 +42,16 @@ class Configuration:
 
     MAXFRAMESTOSAVE
         The maximum number of frames to save as an int. Default value is 60.
+        How the frames are chosen depends on the SAVEMODE property.
         To inspect the current value, use the max_frames_to_save() method. To
         change the value, use the set_max_frames_to_save() method on the
         configuration object or specify the MAXFRAMESTOSAVE environment
         variable.
 
     STDDURATION
-        The standard duration in seconds as a float. Default value is 0.1.
+        The standard duration in seconds as a float, i.e. the time from a
+        frame is shown until the next frame is shown (provided the program
+        prepares the next frame within that time). Default value is 0.1.
         To inspect the current value, use the std_duration() method. To
         change the value, use the set_std_duration() method on the
         configuration object or specify the STDDURATION environment variable.
@@ -60,6 +63,38 @@ class Configuration:
         set_file_to_save() method on the configuration object or specify the
         FILETOSAVE environment variable.
 
+    RENDERBACKEND
+        The backend used to draw the frames as a string. Default value is
+        "tk", which shows the frames in a window. The value "pil" draws
+        the frames into in-memory images with PIL/Pillow instead, and
+        needs no window or display (useful for automatic grading). To
+        inspect the current value, use the render_backend() method. To
+        change the value, use the set_render_backend() method on the
+        configuration object or specify the RENDERBACKEND environment
+        variable.
+
+    SAVEWORKERS
+        The number of worker processes used to draw the frames which are
+        saved to file, as an int. Default value is 0, which means that
+        the frames are drawn by the program itself. With more workers,
+        the program can go on preparing the next frames while the saved
+        frames are drawn (workers are only used where processes can be
+        started with fork, such as on Linux). To inspect the current
+        value, use the save_workers() method. To change the value, use the
+        set_save_workers() method on the configuration object or specify
+        the SAVEWORKERS environment variable.
+
+    SAVEMODE
+        Which frames to save as a string. Default value is "first", which
+        saves the first frames, and ends the program once MAXFRAMESTOSAVE
+        frames have been displayed. The value "last" lets the program run
+        as usual until the window is closed (or the program ends), and
+        then saves the last MAXFRAMESTOSAVE frames displayed; only that
+        many frames are kept in memory at any time. To inspect the
+        current value, use the save_mode() method. To change the value,
+        use the set_save_mode() method on the configuration object or
+        specify the SAVEMODE environment variable.
+
         
     (ENVPRIORITY)
         Whether to prioritize environment variables over the other ways of
@@ -78,8 +113,13 @@ class Configuration:
         "MAXFRAMESTOSAVE": 60,
         "STDDURATION": 0.1,
         "FILETOSAVE": "",
+        "RENDERBACKEND": "tk",
+        "SAVEWORKERS": 0,
+        "SAVEMODE": "first",
     })
 
+    SAVE_MODES: Final = ("first", "last")
+
     def __init__(self):
         self._locked: bool = False
         self._env_priority: Final[bool] = self._get_env_priority()
@@ -163,6 +203,25 @@ class Configuration:
     def file_to_save(self) -> str:
         """Returns the file name in which to save the frames."""
         return str(self._get_property("FILETOSAVE"))
+
+    def render_backend(self) -> str:
+        """Returns the name of the backend used to draw the frames."""
+        return str(self._get_property("RENDERBACKEND"))
+
+    def save_workers(self) -> int:
+        """
+        Returns the number of worker processes used to draw the frames
+        which are saved to file.
+        """
+        return int(self._get_property("SAVEWORKERS"))
+
+    def save_mode(self) -> str:
+        """Returns which frames to save, either "first" or "last"."""
+        save_mode = str(self._get_property("SAVEMODE")).strip().lower()
+        if save_mode not in Configuration.SAVE_MODES:
+            raise ValueError(f"save mode must be one of {Configuration.SAVE_MODES},"
+                             + f" but got {repr(save_mode)}")
+        return save_mode
     
     def set_properties(self, config_map: dict[str, Any]):
         """
@@ -177,6 +236,9 @@ class Configuration:
         MAXFRAMESTOSAVE: int = 60
         STDDURATION: float = 0.1
         FILETOSAVE: str = ""
+        RENDERBACKEND: str = "tk"
+        SAVEWORKERS: int = 0
+        SAVEMODE: str = "first"
 
         The ENVPRIORITY property is not supported by this method.
         """
@@ -232,3 +294,27 @@ class Configuration:
         set to an empty string, then the frames will not be saved.
         """
         self.set_properties({"FILETOSAVE": save_to_file})
+
+    def set_render_backend(self, render_backend: str):
+        """
+        Sets the backend used to draw the frames, either "tk" (show the
+        frames in a window) or "pil" (draw the frames into in-memory
+        images, without a window).
+        """
+        self.set_properties({"RENDERBACKEND": render_backend})
+
+    def set_save_workers(self, save_workers: int):
+        """
+        Sets the number of worker processes used to draw the frames which
+        are saved to file. With 0 workers, the frames are drawn by the
+        program itself.
+        """
+        self.set_properties({"SAVEWORKERS": save_workers})
+
+    def set_save_mode(self, save_mode: str):
+        """
+        Sets which frames to save, either "first" (save the first frames
+        and end the program) or "last" (save the last frames displayed
+        before the window is closed).
+        """
+        self.set_properties({"SAVEMODE": save_mode})
@@ -1,11 +1,11 @@
 import sys
-from tkinter import Canvas, ALL, Tk
-from typing import Any, Final
+from typing import Any, Final, TYPE_CHECKING
 
-from PIL import Image, ImageTk
+if TYPE_CHECKING:
+    from .SimplifiedFrame import SimplifiedFrame
 
 
-class RecordingCanvas(Canvas):
+class RecordingCanvas:
     """
     A SimplifiedCanvas object gives the illusion of being a regular
     Tk.Canvas object from tkinter, by having all the create_ -methods
@@ -16,29 +16,49 @@ class RecordingCanvas(Canvas):
     create_ -methods in this class only return a fake id. The id is not
     used for anything, and is assigned in increasing order starting from
     1 in the order in which the calls are made.
+
+    Nothing is drawn before the calls are replayed by display, which
+    is also the first time any tkinter object is used.
     """
 
-    def __init__(self, root: Tk):
-        self._calls: Final[list[tuple[int, str, tuple[Any], dict[str, Any]]]] = []
-        super().__init__(root)
-        self._is_disabled: bool = False
-        self._tkroot: Final[Tk] = root
+    __slots__ = ('_calls', '_next_id', '_frame')
+
+    def __init__(self, frame: 'SimplifiedFrame|None'=None):
+        self._calls: Final[list[tuple[str, tuple[Any], dict[str, Any]]]] = []
+        self._next_id: int = 1
+        self._frame: Final['SimplifiedFrame|None'] = frame
 
-    def _get_calls(self) -> tuple[tuple[int, str, tuple[Any], dict[str, Any]]]:
-        return tuple(self._calls)
+    def _get_calls(self) -> list[tuple[str, tuple[Any], dict[str, Any]]]:
+        # Not a copy: the caller must not keep the list past _clear()
+        return self._calls
     
+    def _copy_calls(self) -> list[tuple[str, tuple[Any], dict[str, Any]]]:
+        # A copy which the program cannot change by changing the lists
+        # and dicts it passed to the create_ -methods
+        return [(method_name, _copied(args), _copied(kwargs))
+                for method_name, args, kwargs in self._calls]
+
     def _clear(self) -> None:
-        super().delete(ALL)
         self._calls.clear()
 
-    def _disable(self) -> None:
-        self._is_disabled = True
+    def _record(self, method_name: str, args: tuple[Any],
+                kwargs: dict[str, Any]) -> int:
+        self._verify_enabled()
+        idnum: int = self._next_id
+        self._next_id += 1
+        self._calls.append((method_name, args, kwargs))
+        return idnum
+
+    def _ensure_root(self) -> None:
+        # Fonts (as used by text_in_box) need a Tk root, also before
+        # the first call to display
+        if self._frame is not None:
+            self._frame.ensure_root()
 
     def _verify_enabled(self) -> None:
-        # If root is destroyed, we should exit the program
+        # If the window is closed, we should exit the program
         # (otherwise it will hang forever)
-        # TODO: This is a hack, should probably be fixed in a better way
-        if "_is_destroyed" in self._tkroot.__dict__ and self._tkroot.__dict__["_is_destroyed"]:
+        if self._frame is not None and self._frame._is_closed:
             sys.exit(0)
 
     def create_arc(self, *args: Any, **kwargs: Any) -> int:
@@ -49,10 +69,7 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_arc method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_arc
         """
-        self._verify_enabled()
-        idnum: int = super().create_arc(*args, **kwargs)
-        self._calls.append((idnum, "create_arc", args, kwargs))
-        return idnum
+        return self._record("create_arc", args, kwargs)
 
     def create_bitmap(self, *args: Any, **kwargs: Any) -> int:
         """
@@ -62,10 +79,7 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_bitmap method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_bitmap
         """
-        self._verify_enabled()
-        idnum: int = super().create_bitmap(*args, **kwargs)
-        self._calls.append((idnum, "create_bitmap", args, kwargs))
-        return idnum
+        return self._record("create_bitmap", args, kwargs)
 
     def create_image(self, *args: Any, **kwargs: Any) -> int:
         """
@@ -86,11 +100,8 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_image method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_image
         """
-        self._verify_enabled()
-        _pil_to_photoimage(kwargs)
-        idnum: int = super().create_image(*args, **kwargs)
-        self._calls.append((idnum, "create_image", args, kwargs))
-        return idnum
+        _verify_image_kwargs(kwargs)
+        return self._record("create_image", args, kwargs)
 
     def create_line(self, *args: Any, **kwargs: Any) -> int:
         """
@@ -100,10 +111,7 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_line method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_line
         """
-        self._verify_enabled()
-        idnum: int = super().create_line(*args, **kwargs)
-        self._calls.append((idnum, "create_line", args, kwargs))
-        return idnum
+        return self._record("create_line", args, kwargs)
 
     def create_oval(self, *args: Any, **kwargs: Any) -> int:
         """
@@ -113,10 +121,7 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_oval method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_oval
         """
-        self._verify_enabled()
-        idnum: int = super().create_oval(*args, **kwargs)
-        self._calls.append((idnum, "create_oval", args, kwargs))
-        return idnum
+        return self._record("create_oval", args, kwargs)
 
     def create_polygon(self, *args: Any, **kwargs: Any) -> int:
         """
@@ -126,10 +131,7 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_polygon method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_polygon
         """
-        self._verify_enabled()
-        idnum: int = super().create_polygon(*args, **kwargs)
-        self._calls.append((idnum, "create_polygon", args, kwargs))
-        return idnum
+        return self._record("create_polygon", args, kwargs)
 
     def create_rectangle(self, *args: Any, **kwargs: Any) -> int:
         """
@@ -139,10 +141,7 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_rectangle method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_rectangle
         """
-        self._verify_enabled()
-        idnum: int = super().create_rectangle(*args, **kwargs)
-        self._calls.append((idnum, "create_rectangle", args, kwargs))
-        return idnum
+        return self._record("create_rectangle", args, kwargs)
 
     def create_text(self, *args: Any, **kwargs: Any) -> int:
         """
@@ -152,13 +151,28 @@ class RecordingCanvas(Canvas):
         tkinter documentation on the create_text method:
         https://tkinter-docs.readthedocs.io/en/latest/widgets/canvas.html#Canvas.create_text
         """
-        self._verify_enabled()
-        idnum: int = super().create_text(*args, **kwargs)
-        self._calls.append((idnum, "create_text", args, kwargs))
-        return idnum
+        return self._record("create_text", args, kwargs)
 
 
-def _pil_to_photoimage(call_kwargs: dict[str, Any]):
+def _copied(value: Any) -> Any:
+    """
+    Returns a copy of value where lists, tuples and dicts are copied all
+    the way down. Other objects, such as PIL images and fonts, are not
+    copied.
+    """
+    if type(value) is list:
+        return [_copied(item) for item in value]
+    if type(value) is tuple:
+        return tuple([_copied(item) for item in value])
+    if type(value) is dict:
+        return {key: _copied(item) for key, item in value.items()}
+    return value
+
+
+def _verify_image_kwargs(call_kwargs: dict[str, Any]):
+    # Imported here, so that importing uib_inf100_graphics.simple does
+    # not import PIL (or tkinter images) unless images are drawn
+    from PIL import Image
     if 'image' in call_kwargs and 'pil_image' in call_kwargs:
         raise Exception('create_image: uib_inf100_graphics.simple does'
             + ' not support both image= and pil_image= parameters'
@@ -169,11 +183,7 @@ def _pil_to_photoimage(call_kwargs: dict[str, Any]):
                     + " instance of a PIL/Pillow image. Use the 'pil_image'"
                     + 'parameter instead.')
     elif 'pil_image' in call_kwargs:
-        pil_image = call_kwargs['pil_image']
-        del call_kwargs['pil_image']
-        if isinstance(pil_image, Image.Image):
-            call_kwargs['image'] = ImageTk.PhotoImage(pil_image)
-        else:
+        if not isinstance(call_kwargs['pil_image'], Image.Image):
             raise Exception('create_image: pil_image value is not an instance'
                 + ' of a PIL/Pillow image. Use the load_image function from'
                 + ' uib_inf100_graphics.imagetools package to load image as'
@@ -181,3 +191,17 @@ def _pil_to_photoimage(call_kwargs: dict[str, Any]):
     else:
         raise Exception("create_image: canvas from uib_inf100_graphics.simple"
                 + " should use the 'pil_image' parameter")
+
+
+def _pil_to_photoimage(call_kwargs: dict[str, Any]) -> dict[str, Any]:
+    """
+    Returns the keyword arguments of a recorded create_image call, with
+    the pil_image converted to an image which can be drawn on a
+    tkinter canvas. The recorded arguments are not changed.
+    """
+    if 'pil_image' not in call_kwargs:
+        return call_kwargs
+    from uib_inf100_graphics.rendering import photoimage_cache
+    call_kwargs = dict(call_kwargs)
+    call_kwargs['image'] = photoimage_cache.get(call_kwargs.pop('pil_image'))
+    return call_kwargs
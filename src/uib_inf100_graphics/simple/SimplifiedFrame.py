@@ -1,15 +1,25 @@
 import atexit
-import io
+import collections
 import sys
 import time
 import tkinter as tk
-from typing import Final, Any
+from typing import Final, Any, TYPE_CHECKING
 
-from PIL import Image
-
-from uib_inf100_graphics.simple.RecordingCanvas import RecordingCanvas
+from uib_inf100_graphics.rendering import TclDisplayList, get_backend
+from uib_inf100_graphics.simple.RecordingCanvas import RecordingCanvas, _pil_to_photoimage
 from uib_inf100_graphics.simple.Configuration import Configuration
 
+# The frame rendering and saving machinery (which loads
+# multiprocessing) is imported when first used, so that importing
+# uib_inf100_graphics.simple stays fast
+if TYPE_CHECKING:
+    from PIL import Image
+    from uib_inf100_graphics.rendering import FrameRenderer
+
+
+# Set by a Tcl timer when a frame has been shown for its duration
+_FRAME_READY_VAR = "::uib_inf100_graphics_frame_ready"
+
 
 class SimplifiedFrame:
     """
@@ -19,25 +29,36 @@ class SimplifiedFrame:
     method is called.
     """
 
-    def __init__(self, tk_root: tk.Tk):
+    def __init__(self, tk_root: tk.Tk|None=None):
         # Internal variables initialized on object creation
         self._config: Final = Configuration()
-        self._screenshots: list[dict[str, Any]] = []
+        self._frame_renderer: 'FrameRenderer|None' = None
+        self._last_frames: collections.deque[tuple[list[Any], int]]|None = None
         self._is_initialized: bool = False
         self._image_is_saved: bool = False
         self._is_closed: bool = False
         self._mainloop_started: bool = False
         self._next_delay: float = 0
         self._display_call_counter: int = 0
+        self._last_frame_calls: list[Any] = []
+
+        # Frame pacing: the next frame is shown when the current frame
+        # has been shown for its duration, counted from the deadline
+        # it was shown at (or from when it was shown, if it was late)
+        self._next_deadline: float|None = None
+        self._late_frames: int = 0
+        self._dropped_frames: int = 0
+        self._max_lag_sec: float = 0
         
         # Internal variables initialized on first call to display
-        self._tkroot: Final[tk.Tk] = tk_root
+        self._tkroot: tk.Tk|None = tk_root
         self._tkCanvas: tk.Canvas
-        self._recording_canvas: RecordingCanvas
+        self._display_list: TclDisplayList
+        self._is_headless: bool = False
 
         # The variable below is never referenced, but is needed to
         # prevent the garbage collector from deleting image objects.
-        self._lastCanvas: RecordingCanvas
+        self._lastPhotoImages: list[Any] = []
 
     def config(self) -> Configuration:
         """
@@ -62,8 +83,10 @@ class SimplifiedFrame:
 
         The duration parameter determines how long the the image should
         be displayed at minimum before changing the window frame
-        content. This is useful if you want to animate something and
-        control the animation speed. If no value is specifed for
+        content. The time the program spends on preparing the next
+        frame counts as part of the duration, so that the frames of an
+        animation are shown at a steady pace. This is useful if you want
+        to animate something and control the animation speed. If no value is specifed for
         duration, the value specified in the configuration will be used.
         The default value is 0.1 seconds.
 
@@ -73,114 +96,194 @@ class SimplifiedFrame:
         """
         self._display_call_counter += 1
         self._post_config_initialization_phase()
-        self._wait_until_ready()
+        shown_at = self._wait_until_ready()
         self._next_delay = self._config.std_duration() if duration is None else duration
+        self._next_deadline = shown_at + self._next_delay
 
-        self._tkCanvas.delete(tk.ALL)
-        for call in canvas._get_calls():
-            getattr(self._tkCanvas, call[1])(*call[2], **call[3])
-        
-        # Making a copy of the current canvas despite the variable
-        # never being used is necessary in order that references to
-        # any PhotoImage objects created by the tk.Canvas object are
-        # not lost due to garbage collection. The reference Tkinter
-        # keeps to the PhotoImage objects is for some reason not enough
-        # to prevent them from being collected.
-        # https://stackoverflow.com/questions/27430648/tkinter-vanishing-photoimage-issue
-        self._lastCallsCopy = canvas._get_calls()
+        # Without a window, nothing is drawn until a frame is saved, or a
+        # snapshot is taken (both are drawn from the recorded calls)
+        if not self._is_headless:
+            # The whole frame is drawn with a single call into Tcl,
+            # instead of one call for each item
+            self._display_list.delete(tk.ALL)
+            photoimages = []
+            for method_name, args, kwargs in canvas._get_calls():
+                if method_name == "create_image":
+                    kwargs = _pil_to_photoimage(kwargs)
+                    photoimages.append(kwargs["image"])
+                self._display_list.create(method_name, args, kwargs)
+            self._display_list.flush()
+
+            # Keeping references to the PhotoImage objects despite the
+            # variable never being used is necessary in order that they
+            # are not lost due to garbage collection. The reference
+            # Tkinter keeps to the PhotoImage objects is for some reason
+            # not enough to prevent them from being collected.
+            # https://stackoverflow.com/questions/27430648/tkinter-vanishing-photoimage-issue
+            self._lastPhotoImages = photoimages
+        # The calls are kept after the canvas is cleared, and possibly
+        # rasterized later, so they must not change with the program's
+        # lists of coordinates
+        self._last_frame_calls = canvas._copy_calls()
+        self._take_screenshot_if_required(self._last_frame_calls, self._next_delay)
         if clear_canvas:
             canvas._clear()
 
-        self._tkCanvas.update()
-        self._tkroot.update()
-        self._take_screenshot_if_required(self._next_delay)
-        if self._display_call_counter >= self._config.max_frames_to_save():
+        if not self._is_headless:
+            self._tkCanvas.update()
+            self._tkroot.update()
+        if (self._config.save_mode() == "first"
+                and self._display_call_counter >= self._config.max_frames_to_save()):
             self._save_as_image()
 
         if self._config.file_to_save() and self._image_is_saved:
             sys.exit(0)
 
-    def _wait_until_ready(self):
-        if self._config.file_to_save():
-            return
-        target_time = time.time() + self._next_delay
-        while time.time() < target_time:
-            time_to_sleep = max(0, min(0.1, target_time - time.time()))
-            time.sleep(time_to_sleep)
+    def frame_stats(self) -> dict[str, int|float]:
+        """
+        Returns counters describing how well the frames have kept to
+        their durations: frames is the number of frames displayed,
+        late_frames the number of frames which were shown after their
+        deadline (because the program spent longer than the duration of
+        the previous frame on preparing them), dropped_frames the number
+        of whole frame periods lost to such delays, and max_lag_ms how
+        late the latest frame was at most.
+        """
+        return {
+            "frames": self._display_call_counter,
+            "late_frames": self._late_frames,
+            "dropped_frames": self._dropped_frames,
+            "max_lag_ms": 1000 * self._max_lag_sec,
+        }
+
+    def get_snapshot(self) -> 'Image.Image':
+        """
+        Returns a PIL image with the frame displayed most recently (a
+        white image if no frame has been displayed yet). The image is
+        drawn from the recorded drawing calls of the frame, so it works
+        without a window, and does not depend on what is on screen.
+        """
+        from uib_inf100_graphics.rendering import render_calls
+        return render_calls(self._last_frame_calls, self._config.width(),
+                            self._config.height())
+
+    def ensure_root(self) -> None:
+        """
+        Creates the Tk root of this frame without showing the window, if
+        it is not created yet. Fonts can only be created once a Tk root
+        exists; the window itself is shown on the first call to display.
+        """
+        if self._tkroot is None:
+            self._tkroot = tk.Tk()
+            self._tkroot.withdraw()
+
+    def _wait_until_ready(self) -> float:
+        # Waits until the deadline of the frame currently shown, and
+        # returns the time at which the next frame is shown
+        now = time.perf_counter()
+        deadline = self._next_deadline
+        if deadline is None or self._is_headless:
+            return now
+        if self._config.file_to_save() and self._config.save_mode() == "first":
+            return now
+        if now > deadline:
+            lag = now - deadline
+            self._late_frames += 1
+            if self._next_delay > 0:
+                self._dropped_frames += int(lag / self._next_delay)
+            self._max_lag_sec = max(self._max_lag_sec, lag)
             self._tkroot.update()
-            if "_is_destroyed" in self._tkroot.__dict__ and self._tkroot.__dict__["_is_destroyed"]:
-                sys.exit(0)
+            shown_at = now
+        else:
+            # A single timer in the Tk event loop rather than a sleep, so
+            # that the window stays responsive until the deadline
+            self._tkroot.tk.call("after", int(1000 * (deadline - now)),
+                                 "set", _FRAME_READY_VAR, 1)
+            self._tkroot.tk.call("vwait", _FRAME_READY_VAR)
+            shown_at = deadline
+        if self._is_closed:
+            sys.exit(0)
+        return shown_at
 
     def _post_config_initialization_phase(self):
         if not self._is_initialized:
             self._is_initialized = True
             self._config.lock()
+            self._config.save_mode() # Fails early if not a valid mode
+            if get_backend(self._config.render_backend()) == "pil":
+                self._is_headless = True
+                atexit.register(self._closing)
+                return
+            if self._tkroot is None:
+                self._tkroot = tk.Tk()
+            self._tkroot.deiconify()
             self._tkroot.title(self._config.title())
             def close_window_clicked():
                 self._save_as_image()
                 self._tkroot.destroy()
-                self._tkroot.__dict__["_is_destroyed"] = True
+                self._is_closed = True
             self._tkroot.protocol("WM_DELETE_WINDOW", close_window_clicked)
             self._tkCanvas = tk.Canvas(self._tkroot,
                     width=self._config.width(),
                     height=self._config.height())
             self._tkCanvas.pack()
+            self._display_list = TclDisplayList(self._tkCanvas)
             self._tkroot.resizable(False, False)
             atexit.register(self._closing)
 
-    def _take_screenshot_if_required(self, duration_sec: float):
-        if self._image_is_saved:
+    def _take_screenshot_if_required(self, calls: list[Any],
+                                     duration_sec: float):
+        # The frame is rasterized from the recorded calls (also when
+        # shown in a Tk window), possibly in a worker process, and
+        # appended to the file. When saving the last frames, the
+        # recorded calls of the latest frames are kept in a ring buffer
+        # instead, and rasterized when the frames are saved
+        if not self._saves_frame():
+            return
+        duration_ms = max(1, int(duration_sec * 1000))
+        if self._config.save_mode() == "last":
+            if self._last_frames is None:
+                self._last_frames = collections.deque(
+                        maxlen=self._config.max_frames_to_save())
+                # Created now, as the frames are saved when the program
+                # exits, when modules can no longer be imported
+                self._get_frame_renderer()
+            self._last_frames.append((calls, duration_ms))
             return
-        if (self._display_call_counter < self._config.max_frames_to_save() 
-                and self._config.file_to_save()):
-            self._screenshots.append({
-                "ps": self._tkCanvas.postscript(), # type: ignore
-                "duration_ms": max(1, int(duration_sec * 1000)),
-            })
+        self._get_frame_renderer().add(calls, duration_ms)
+
+    def _saves_frame(self) -> bool:
+        if self._image_is_saved or not self._config.file_to_save():
+            return False
+        return (self._config.save_mode() == "last"
+                or self._display_call_counter < self._config.max_frames_to_save())
+
+    def _get_frame_renderer(self) -> 'FrameRenderer':
+        if self._frame_renderer is None:
+            from uib_inf100_graphics.rendering import FrameRenderer, open_animation_writer
+            self._frame_renderer = FrameRenderer(
+                    open_animation_writer(self._config.file_to_save()),
+                    self._config.width(), self._config.height(),
+                    self._config.save_workers())
+        return self._frame_renderer
 
     def _closing(self):
         self._save_as_image()
         if self._mainloop_started:
             return
-        if (not self._config.file_to_save()):
+        if (not self._config.file_to_save()) and (not self._is_headless):
             self._mainloop_started = True
             self._tkroot.mainloop()
         
     def _save_as_image(self) -> None:
+        # Completes the file with the frames captured so far
         if self._image_is_saved:
             return
         self._image_is_saved = True
-        configname: str = self._config.file_to_save()
-        if not configname:
-            return
-        if len(self._screenshots) == 0:
-            return
-        
-        position_of_last_dot = configname.rfind(".")
-        corefilename: str
-        extension: str
-        if position_of_last_dot == -1:
-            corefilename = configname
-            extension = "png"
-        else:
-            corefilename = configname[:position_of_last_dot]
-            extension = configname[position_of_last_dot + 1:]
-        if len(corefilename) == 0:
-            corefilename = "screenshot"
-        
-        postscripts = [ screenshot["ps"] for screenshot in self._screenshots]
-        durations = [ screenshot["duration_ms"] for screenshot in self._screenshots]
-        images = [ Image.open(io.BytesIO(ps.encode("utf-8"))) for ps in postscripts]
-
-        save_all: bool = extension in ["gif", "tiff", "webp", "png"]
-        if save_all:
-            images[0].save(
-                    f"{corefilename}.{extension}",
-                    save_all=save_all,
-                    append_images=images[1:],
-                    duration=durations,
-                    loop=0)
-        else:
-            for i in range(len(images)):
-                images[i].save(f"{corefilename}_{i+1}.{extension}")
-        
+        if self._last_frames:
+            frame_renderer = self._get_frame_renderer()
+            while self._last_frames:
+                frame_renderer.add(*self._last_frames.popleft())
+        if self._frame_renderer is not None:
+            self._frame_renderer.close()
+            print(f'Saved {self._frame_renderer.writer.summary()}')
@@ -1 +1 @@
-from .globals import canvas, config, display
+from .globals import canvas, config, display, frame_stats, get_snapshot
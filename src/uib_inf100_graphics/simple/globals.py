@@ -1,15 +1,24 @@
-from tkinter import Tk
-from typing import Final
+from typing import Final, TYPE_CHECKING
 
 from uib_inf100_graphics.simple.SimplifiedFrame import SimplifiedFrame
 from uib_inf100_graphics.simple.RecordingCanvas import RecordingCanvas
 
+if TYPE_CHECKING:
+    from PIL import Image
 
-_tk_root = Tk()
-_frame: Final = SimplifiedFrame(_tk_root)
-canvas: Final = RecordingCanvas(_tk_root)    
+
+# Nothing is created in tkinter before the first call to display, so
+# importing the package has no side effects (and works without a display)
+_frame: Final = SimplifiedFrame(None)
+canvas: Final = RecordingCanvas(_frame)
 config: Final = _frame.config()
 
 def display(canvas: RecordingCanvas, min_duration_sec: float|None=None,
             clear_canvas: bool=True):
-    _frame.display(canvas, min_duration_sec, clear_canvas)
\ No newline at end of file
+    _frame.display(canvas, min_duration_sec, clear_canvas)
+
+def frame_stats() -> dict[str, int|float]:
+    return _frame.frame_stats()
+
+def get_snapshot() -> 'Image.Image':
+    return _frame.get_snapshot()
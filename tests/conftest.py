@@ -0,0 +1,17 @@
+import tkinter
+
+import pytest
+
+
+def _has_display() -> bool:
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        return False
+    root.destroy()
+    return True
+
+
+HAS_DISPLAY = _has_display()
+
+requires_display = pytest.mark.skipif(not HAS_DISPLAY, reason='no display for Tk')
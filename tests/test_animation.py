@@ -0,0 +1,54 @@
+"""
+Tests for writing frames to animation files.
+"""
+from PIL import Image
+
+from uib_inf100_graphics.rendering import open_animation_writer
+
+COLORS = ['red', 'red', 'red', 'blue', 'blue']
+
+
+def _write(filename: str) -> list[tuple[int, ...]]:
+    writer = open_animation_writer(filename)
+    for color in COLORS:
+        writer.add(Image.new('RGB', (20, 10), color), 100)
+    writer.close()
+    colors = []
+    with Image.open(filename) as frames:
+        for i in range(getattr(frames, 'n_frames', 1)):
+            frames.seek(i)
+            colors.append(frames.convert('RGB').getpixel((5, 5)))
+    return colors
+
+
+def test_png_merges_identical_frames(tmp_path):
+    assert _write(str(tmp_path / 'anim.png')) == [(255, 0, 0), (0, 0, 255)]
+
+
+def test_tiff_keeps_identical_frames_as_it_has_no_durations(tmp_path):
+    assert _write(str(tmp_path / 'anim.tiff')) == [(255, 0, 0)] * 3 + [(0, 0, 255)] * 2
+
+
+def test_gif_round_trip_keeps_pixels_and_durations(tmp_path):
+    filename = str(tmp_path / 'anim.gif')
+    frames = [('red', 100), ('red', 50), ('green', 100), ('blue', 30),
+              ('blue', 70), ('red', 40)]
+    writer = open_animation_writer(filename)
+    for color, duration_ms in frames:
+        image = Image.new('RGB', (20, 10), color)
+        image.putpixel((3, 3), (10, 20, 30)) # a color shared by all frames
+        writer.add(image, duration_ms)
+    writer.close()
+    assert (writer.frames, writer.frames_stored) == (6, 4)
+    with Image.open(filename) as gif:
+        assert gif.n_frames == 4
+        assert gif.info.get('loop') == 0
+        pixels, durations = [], []
+        for i in range(gif.n_frames):
+            gif.seek(i)
+            rgb = gif.convert('RGB')
+            pixels.append((rgb.getpixel((10, 5)), rgb.getpixel((3, 3))))
+            durations.append(gif.info['duration'])
+    colors = [(255, 0, 0), (0, 128, 0), (0, 0, 255), (255, 0, 0)]
+    assert pixels == [(color, (10, 20, 30)) for color in colors]
+    assert durations == [150, 100, 100, 40]
@@ -0,0 +1,128 @@
+"""
+Tests for running canvas commands in batches with TclDisplayList, on a
+stub canvas in a Tcl interpreter (no display needed) and on a Tk canvas.
+"""
+import tkinter
+
+import pytest
+
+from uib_inf100_graphics.event_app.uib_inf100_graphics import App
+from uib_inf100_graphics.rendering import TclDisplayList
+
+from conftest import requires_display
+
+
+class CountingTk:
+    # Counts the calls from Python into Tcl
+    def __init__(self, tk):
+        self._tk = tk
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tk.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._tk, name)
+
+
+class StubCanvas(tkinter.Canvas):
+    # A tkinter Canvas whose Tcl command records each command, numbers the
+    # items created 1, 2, 3, ... like Tk does, and rejects the option -bad
+    def __init__(self):
+        interpreter = tkinter.Tcl()
+        interpreter.eval('''
+            set ::stub_commands {}
+            set ::stub_next_id 0
+            proc ::stub_canvas {args} {
+                if {[lsearch -exact $args -bad] >= 0} {
+                    error {unknown option "-bad"}
+                }
+                lappend ::stub_commands $args
+                if {[lindex $args 0] eq "create"} {
+                    return [incr ::stub_next_id]
+                }
+                return {}
+            }
+        ''')
+        self.tk = CountingTk(interpreter.tk)
+        self._w = '::stub_canvas'
+        self._tclCommands = None
+
+    def commands(self) -> list[str]:
+        return self.tk.eval('join $::stub_commands \\n').splitlines()
+
+
+def test_commands_are_run_in_chunks_and_the_last_id_is_returned():
+    canvas = StubCanvas()
+    display_list = TclDisplayList(canvas, chunk_size=3)
+    display_list.delete('all')
+    for i in range(5):
+        display_list.create('create_rectangle', (i, 0, [i + 1, 1]), {'fill': 'red', 'outline': None})
+    display_list.coords(2, (0, 0, 9, 9))
+    display_list.tag_raise(5, 2)
+    assert len(display_list) == 8
+    calls = canvas.tk.calls
+    assert display_list.flush() == 5
+    assert canvas.tk.calls - calls == 3 # one per chunk of 3 commands
+    assert len(display_list) == 0
+    assert canvas.commands() == ['delete all'] + [
+        f'create rectangle {i} 0 {i + 1} 1 -fill red' for i in range(5)
+    ] + ['coords 2 0 0 9 9', 'raise 5 2']
+    calls = canvas.tk.calls
+    assert display_list.flush() is None
+    assert canvas.tk.calls == calls
+    display_list.itemconfigure(3, {'fill': 'blue'})
+    assert display_list.flush() is None # no item was created
+
+
+def test_failing_command_is_named_and_the_rest_is_discarded():
+    canvas = StubCanvas()
+    display_list = TclDisplayList(canvas, chunk_size=2)
+    display_list.create('create_oval', (0, 0, 5, 5), {})
+    display_list.create('create_line', (0, 0, 5, 5), {})
+    display_list.create('create_oval', (1, 1, 5, 5), {})
+    source = ('create_text', (10, 10), {'text': 'Hi', 'bad': 1})
+    display_list.itemconfigure(3, {'bad': 1}, source)
+    display_list.create('create_oval', (2, 2, 5, 5), {})
+    with pytest.raises(tkinter.TclError) as error:
+        display_list.flush()
+    call = "canvas.create_text(10, 10, text='Hi', bad=1)"
+    assert error.value.canvas_call == call
+    assert str(error.value) == call + ': unknown option "-bad"'
+    assert len(canvas.commands()) == 3
+    assert len(display_list) == 0
+
+
+@requires_display
+def test_created_items_get_consecutive_ids_on_a_tk_canvas():
+    root = tkinter.Tk()
+    try:
+        canvas = tkinter.Canvas(root)
+        display_list = TclDisplayList(canvas)
+        for i in range(3):
+            display_list.create('create_rectangle', (i, i, 10, 10), {})
+        assert display_list.flush() == 3
+        assert canvas.find_all() == (1, 2, 3)
+    finally:
+        root.destroy()
+
+
+def test_drawing_call_error_is_printed_with_the_call(capsys):
+    # The error is raised when redraw_all has returned, so the traceback
+    # has only frames of the package (here a stand-in for the wrapper)
+    namespace = {}
+    exec(compile('def _redraw_all_wrapper(error):\n    raise error\n',
+                 '/uib_inf100_graphics/event_app/app.py', 'exec'), namespace)
+    call = "canvas.create_oval(1, 2, 3, 4, fil='red')"
+    error = tkinter.TclError(f'{call}: unknown option "-fil"')
+    error.canvas_call = call
+    try:
+        namespace['_redraw_all_wrapper'](error)
+    except tkinter.TclError as e:
+        traceback = e.__traceback__.tb_next
+    App(backend='pil')._print_user_traceback(error, traceback)
+    printed = capsys.readouterr().out
+    assert 'No traceback available' not in printed
+    assert f'    {call}\n' in printed
+    assert printed.endswith(f'Exception: {call}: unknown option "-fil"\n')
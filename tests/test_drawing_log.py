@@ -0,0 +1,38 @@
+"""
+Tests for the log of drawing calls kept by the event app canvas.
+"""
+from PIL import Image
+
+from uib_inf100_graphics.event_app.uib_inf100_graphics import App
+
+
+class LineApp(App):
+    def app_started(app):
+        app.points = [(0, 0), (10, 10)]
+
+    def redraw_all(app, canvas):
+        canvas.create_line(app.points, fill='red')
+
+
+def test_logged_calls_do_not_change_with_the_model():
+    app = LineApp(backend='pil')
+    app.points.append((20, 0))
+    app.points[0] = (5, 5)
+    [(method_name, args, kwargs)] = app._canvas.logged_drawing_calls
+    assert (method_name, args, kwargs) == ('create_line', ([(0, 0), (10, 10)],), {'fill': 'red'})
+
+
+def test_log_has_the_calls_as_drawn():
+    sprite = Image.new('RGB', (4, 4), 'red')
+    class LogApp(App):
+        def redraw_all(app, canvas):
+            canvas.create_rectangle(0, 0, [10, 10], fill='blue')
+            canvas.create_text(5, 5, text='hi', anchor='nw')
+            canvas.create_image(5, 5, pil_image=sprite, anchor='nw')
+    app = LogApp(backend='pil')
+    rectangle, text, image = app._canvas.logged_drawing_calls
+    assert rectangle == ('create_rectangle', (0, 0, [10, 10]), {'fill': 'blue'})
+    assert text == ('create_text', (5, 5), {'text': 'hi', 'anchor': 'nw'})
+    # As before, the pil_image is replaced by the image it is drawn as
+    method_name, args, kwargs = image
+    assert (method_name, args, sorted(kwargs)) == ('create_image', (5, 5), ['anchor', 'image'])
@@ -0,0 +1,173 @@
+"""
+Tests for how the event app schedules its work. The app is run headless,
+then given a FakeRoot in place of Tk, so that the calls it schedules with
+after() are run by the test, and the clock is set by the test.
+"""
+import time
+
+from uib_inf100_graphics.event_app.types import KeyEvent, MouseEvent
+from uib_inf100_graphics.event_app.uib_inf100_graphics import App, TopLevelApp
+
+
+class FakeRoot:
+    # Keeps the calls scheduled with after() until run_pending is called
+    def __init__(self):
+        self.pending: dict[int, tuple] = {}
+        self._next_id = 0
+
+    def after(self, delay, fn):
+        self._next_id += 1
+        self.pending[self._next_id] = (delay, fn)
+        return self._next_id
+
+    def after_cancel(self, id):
+        self.pending.pop(id, None)
+
+    def delays(self) -> list:
+        return [delay for delay, fn in self.pending.values()]
+
+    def run_pending(self):
+        pending, self.pending = self.pending, {}
+        for delay, fn in pending.values():
+            fn()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def start(app_class, monkeypatch):
+    # Returns the app, its FakeRoot and the clock (at 0 when the app started)
+    clock = Clock()
+    monkeypatch.setattr(time, 'perf_counter', clock)
+    app = app_class(backend='pil')
+    root = app._root = FakeRoot()
+    return app, root, clock
+
+
+class TickingApp(App):
+    def app_started(app):
+        app.timer_delay = 125
+        app.ticks = 0
+
+    def timer_fired(app):
+        app.ticks += 1
+
+    def redraw_all(app, canvas):
+        canvas.create_text(10, 10, text=str(app.ticks))
+
+
+def test_late_timer_catches_up_on_missed_deadlines_and_skips_the_rest(monkeypatch):
+    app, root, clock = start(TickingApp, monkeypatch)
+    app._timer_fired_wrapper()
+    assert app.ticks == 1
+    # 375 ms late for the deadline at 125 ms: that and 3 more are due
+    clock.now = 0.5
+    app._timer_fired_wrapper()
+    stats = app.get_frame_stats()
+    assert app.ticks == stats['ticks'] == 5
+    assert (stats['dropped_frames'], stats['skipped_ticks'], stats['lag_ms']) == (3, 0, 375)
+    # 1250 ms late for the deadline at 625 ms: 11 are due, but only 5 are run
+    clock.now = 1.875
+    app._timer_fired_wrapper()
+    stats = app.get_frame_stats()
+    assert app.ticks == stats['ticks'] == 10
+    assert (stats['dropped_frames'], stats['skipped_ticks'], stats['lag_ms']) == (7, 6, 1250)
+    # The next deadline is still on the 125 ms grid
+    assert app._nextTimerTime == 2.0
+    assert 125 in root.delays()
+
+
+class CountingApp(App):
+    def app_started(app):
+        app.count = 0
+
+    def key_pressed(app, event):
+        app.count += 1
+
+    def redraw_all(app, canvas):
+        canvas.create_text(10, 10, text=str(app.count))
+
+
+def test_burst_of_events_gets_a_single_redraw(monkeypatch):
+    app, root, clock = start(CountingApp, monkeypatch)
+    for _ in range(5):
+        app._key_pressed_wrapper(KeyEvent('a'))
+    stats = app.get_frame_stats()
+    assert (stats['frames'], stats['requested'], stats['coalesced']) == (1, 6, 4)
+    # Not sooner than 1/target_fps seconds after the redraw in app_started
+    assert root.delays() == [16]
+    root.run_pending()
+    assert app.get_frame_stats()['frames'] == 2
+    assert app._canvas.logged_drawing_calls[-1][2]['text'] == '5'
+    # Long after the last redraw, the next one waits only for Tk to be idle
+    clock.now = 1.0
+    app._key_pressed_wrapper(KeyEvent('a'))
+    assert root.delays() == ['idle']
+
+
+class MovingApp(App):
+    def app_started(app):
+        app.moves = []
+
+    def mouse_moved(app, event):
+        app.moves.append(('moved', event.x, event.y))
+
+    def mouse_dragged(app, event):
+        app.moves.append(('dragged', event.x, event.y))
+
+    def redraw_all(app, canvas):
+        canvas.create_text(10, 10, text=str(len(app.moves)))
+
+
+def test_only_the_latest_mouse_motion_is_delivered(monkeypatch):
+    app, root, clock = start(MovingApp, monkeypatch)
+    for x in range(10, 60, 10):
+        app._mouse_motion_event(MouseEvent(x, 20))
+    assert app.moves == []
+    assert root.delays() == ['idle']
+    root.run_pending() # the motion, which requests a redraw
+    assert app.moves == [('moved', 50, 20)]
+    assert app.get_frame_stats()['requested'] == 2
+    # Motion back to where the mouse was is not a move
+    app._mouse_motion_event(MouseEvent(30, 20))
+    app._mouse_motion_event(MouseEvent(50, 20))
+    root.run_pending()
+    assert app.moves == [('moved', 50, 20)]
+    app._mouse_pressed_wrapper(MouseEvent(50, 20))
+    app._mouse_motion_event(MouseEvent(55, 25))
+    app._mouse_motion_event(MouseEvent(60, 30))
+    root.run_pending()
+    assert app.moves == [('moved', 50, 20), ('dragged', 60, 30)]
+
+
+# Top-level functions for the TopLevelApp in the test below
+def modes_app_started(app):
+    app.keys = []
+
+def modes_key_pressed(app, event):
+    app.keys.append(('start', event.key))
+    if event.key == 'g':
+        app.mode = 'game'
+
+def modes_game_key_pressed(app, event):
+    app.keys.append(('game', event.key))
+    if event.key == 'm':
+        app.mode = 'menu' # which has no menu_key_pressed
+
+def modes_redraw_all(app, canvas):
+    canvas.create_text(10, 10, text=str(len(app.keys)))
+
+
+def test_handlers_are_looked_up_again_when_the_mode_changes():
+    app = TopLevelApp(fnPrefix='modes_', backend='pil')
+    for key in ['a', 'g', 'b', 'm', 'c']:
+        app._key_pressed_wrapper(KeyEvent(key))
+    assert app.keys == [('start', 'a'), ('start', 'g'), ('game', 'b'), ('game', 'm')]
+    app.mode = None
+    app._key_pressed_wrapper(KeyEvent('d'))
+    assert app.keys[-1] == ('start', 'd')
@@ -0,0 +1,51 @@
+"""
+Tests for rasterizing recorded drawing calls in worker processes.
+"""
+import tkinter.font
+
+from PIL import Image
+
+from uib_inf100_graphics.rendering import AnimationWriter, FrameRenderer
+
+from conftest import requires_display
+
+
+class ListWriter(AnimationWriter):
+    def __init__(self):
+        super().__init__('frames')
+        self.images: list[Image.Image] = []
+
+    def add(self, image: Image.Image, duration_ms: int) -> None:
+        self.images.append(image)
+
+    def close(self) -> None:
+        pass
+
+
+def test_calls_changed_after_add_do_not_change_the_frame():
+    writer = ListWriter()
+    renderer = FrameRenderer(writer, 20, 20, workers=1)
+    coords = [0, 0, 10, 10]
+    calls = [('create_rectangle', (coords,), {'fill': 'red', 'width': 0})]
+    renderer.add(calls, 100)
+    coords[:] = [10, 10, 20, 20]
+    calls[0][2]['fill'] = 'blue'
+    renderer.add(calls, 100)
+    renderer.close()
+    assert [image.getpixel((5, 5)) for image in writer.images] == [(255, 0, 0), (255, 255, 255)]
+    assert [image.getpixel((15, 15)) for image in writer.images] == [(255, 255, 255), (0, 0, 255)]
+
+
+@requires_display
+def test_frames_with_font_objects_are_rendered_by_workers():
+    root = tkinter.Tk()
+    try:
+        writer = ListWriter()
+        renderer = FrameRenderer(writer, 40, 20, workers=1)
+        font = tkinter.font.Font(root=root, family='Helvetica', size=12)
+        renderer.add([('create_text', (20, 10), {'text': 'Hi', 'font': font})], 100)
+        assert renderer._pool is not None and len(renderer._in_progress) == 1
+        renderer.close()
+        assert len(writer.images) == 1
+    finally:
+        root.destroy()
@@ -0,0 +1,61 @@
+"""
+Tests for the cache of PhotoImage conversions, and for the canvas
+keeping the PhotoImages it shows alive (these need a display for Tk).
+"""
+from PIL import Image
+
+from uib_inf100_graphics.event_app.uib_inf100_graphics import App
+from uib_inf100_graphics.rendering import PhotoImageCache, photoimage_cache
+
+from conftest import requires_display
+
+
+def test_palette_images_differing_only_in_palette_have_different_keys():
+    red = Image.new('P', (4, 4), 0)
+    red.putpalette([255, 0, 0] * 256)
+    blue = red.copy()
+    blue.putpalette([0, 0, 255] * 256)
+    assert red.tobytes() == blue.tobytes()
+    assert PhotoImageCache._key(red) != PhotoImageCache._key(blue)
+    transparent = red.copy()
+    transparent.info['transparency'] = 0
+    assert PhotoImageCache._key(red) != PhotoImageCache._key(transparent)
+    assert PhotoImageCache._key(red) == PhotoImageCache._key(red.copy())
+
+
+@requires_display
+def test_cache_converts_each_content_once_and_evicts_by_size():
+    cache = PhotoImageCache(max_bytes=4 * 10 * 10)
+    red = Image.new('RGB', (10, 10), 'red')
+    assert cache.get(red) is cache.get(red.copy())
+    cache.get(Image.new('RGB', (10, 10), 'blue'))
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 2, 1)
+    assert stats['entries'] == 1
+
+
+@requires_display
+def test_canvas_keeps_shown_images_alive_after_eviction():
+    sprites = [Image.new('RGB', (8, 8), color) for color in ('red', 'green', 'blue')]
+    results = []
+    class SpriteApp(App):
+        def app_started(app):
+            app.timer_delay = 1
+        def redraw_all(app, canvas):
+            for i, sprite in enumerate(sprites):
+                canvas.create_image(10 * i, 0, pil_image=sprite, anchor='nw')
+        def timer_fired(app):
+            canvas = app._canvas
+            names = [canvas.itemcget(item_id, 'image') for item_id in canvas.find_all()
+                     if canvas.type(item_id) == 'image']
+            results.append(all(name in canvas.tk.splitlist(canvas.tk.call('image', 'names'))
+                               for name in names) and len(names) == len(sprites))
+            app.quit()
+    max_bytes = photoimage_cache.max_bytes
+    photoimage_cache.max_bytes = 1 # evicts all but the latest conversion
+    try:
+        SpriteApp(backend='tk')
+    finally:
+        photoimage_cache.max_bytes = max_bytes
+        photoimage_cache.clear()
+    assert results == [True]
@@ -0,0 +1,49 @@
+"""
+Tests for turning Tk's keysym, char and state of a key press into the
+key event apps get, without a display.
+"""
+import pytest
+
+from uib_inf100_graphics.event_app.types import KeyEvent, _key_info
+
+SHIFT, CTRL, ALT, ALT_MAC = 0x1, 0x4, 0x8, 0x80
+
+@pytest.mark.parametrize('keysym, char, state, expected', [
+    # Printable characters are their own key
+    ('a', 'a', 0, ('a', False, False, False)),
+    ('A', 'A', SHIFT, ('A', False, False, True)),
+    ('x', 'x', ALT, ('x', False, True, False)),
+    ('x', 'x', ALT_MAC, ('x', False, True, False)),
+    # Whitespace and control characters have names
+    ('space', ' ', 0, ('Space', False, False, False)),
+    ('Return', '\r', 0, ('Enter', False, False, False)),
+    ('KP_Enter', '\n', 0, ('Enter', False, False, False)),
+    ('Tab', '\t', 0, ('Tab', False, False, False)),
+    ('BackSpace', '\b', 0, ('Backspace', False, False, False)),
+    ('Delete', chr(127), 0, ('Delete', False, False, False)),
+    ('Escape', chr(27), 0, ('Escape', False, False, False)),
+    # Keys without a character are named by their keysym
+    ('Left', '', 0, ('Left', False, False, False)),
+    ('F5', '', SHIFT, ('F5', False, False, True)),
+    ('Greek_alpha', 'α', 0, ('Greek_alpha', False, False, False)),
+    # Modifier keys pressed on their own
+    ('Shift_L', '', SHIFT, ('Modifier_Key', False, False, True)),
+    ('Control_R', '', CTRL, ('Modifier_Key', True, False, False)),
+    ('Caps_Lock', '', 0, ('Modifier_Key', False, False, False)),
+    # Control combinations get a control- prefix, except named keys
+    ('a', 'a', CTRL, ('control-a', True, False, False)),
+    ('a', '\x01', CTRL, ('control-a', True, False, False)),
+    ('z', '\x1a', CTRL | SHIFT, ('control-z', True, False, True)),
+    ('a', '\x01', 0, ('control-a', False, False, False)),
+    ('Return', '\r', CTRL, ('Enter', True, False, False)),
+    ('Left', '', CTRL, ('Left', True, False, False)),
+])
+def test_key_info(keysym, char, state, expected):
+    assert _key_info(keysym, char, state) == expected
+
+
+def test_key_event_from_tk_substitutions():
+    event = KeyEvent._from_tk('s', '\x13', str(CTRL | SHIFT))
+    assert (event.key, event.ctrl, event.alt, event.shift) == ('control-s', True, False, True)
+    with pytest.raises(Exception, match='event.key'):
+        event.keysym
@@ -0,0 +1,169 @@
+"""
+Tests for how the event app notices changes to the model: redraws are
+skipped only when the model certainly has not changed, and changes made
+in redraw_all are reported as MVC violations.
+"""
+from PIL import Image
+
+from uib_inf100_graphics.event_app.types import KeyEvent
+from uib_inf100_graphics.event_app.uib_inf100_graphics import App
+
+
+class PositionApp(App):
+    def app_started(app):
+        app.pos = [-1, 0]
+
+    def key_pressed(app, event):
+        if event.key == 'Left':
+            app.pos[0] -= 1
+
+    def redraw_all(app, canvas):
+        canvas.create_text(10, 10, text=str(app.pos))
+
+
+def press(app, key):
+    app._key_pressed_wrapper(KeyEvent(key))
+
+def frames(app):
+    return app.get_frame_stats()['frames']
+
+
+def test_in_place_change_is_redrawn_even_if_hashes_collide():
+    app = PositionApp(backend='pil')
+    assert hash(-1) == hash(-2)
+    press(app, 'Left')
+    assert app.pos == [-2, 0]
+    assert frames(app) == 2
+    assert app._canvas.logged_drawing_calls[-1][2]['text'] == '[-2, 0]'
+
+
+def test_redraw_is_skipped_when_nothing_changed():
+    app = PositionApp(backend='pil')
+    press(app, 'Right')
+    assert frames(app) == 1
+    assert app.get_frame_stats()['unchanged'] == 1
+
+
+def test_change_between_equal_values_of_different_types_is_redrawn():
+    app = PositionApp(backend='pil')
+    app.pos[1] = 0.0
+    press(app, 'Right')
+    assert frames(app) == 2
+
+
+def test_attributes_set_before_app_init_are_part_of_the_model():
+    class EarlyApp(PositionApp):
+        def __init__(app):
+            app.board = [[0, 0], [0, 0]]
+            super().__init__(backend='pil')
+        def key_pressed(app, event):
+            app.board[1][1] = 1
+    app = EarlyApp()
+    assert 'board' not in app._ignoredFields
+    press(app, 'a')
+    assert frames(app) == 2
+    assert 'board=' in repr(app)
+
+
+def test_model_with_opaque_objects_is_always_redrawn():
+    class ImageApp(PositionApp):
+        def app_started(app):
+            super().app_started()
+            app.image = Image.new('RGB', (2, 2))
+        def key_pressed(app, event):
+            app.image.putpixel((0, 0), (255, 0, 0))
+    app = ImageApp(backend='pil')
+    press(app, 'a')
+    assert frames(app) == 2
+
+
+def test_model_with_classes_is_always_redrawn():
+    class Settings:
+        color = 'red'
+    class SettingsApp(PositionApp):
+        def app_started(app):
+            super().app_started()
+            app.settings = Settings
+        def key_pressed(app, event):
+            Settings.color = 'blue'
+    app = SettingsApp(backend='pil')
+    press(app, 'a')
+    assert frames(app) == 2
+    assert app.get_frame_stats()['unchanged'] == 0
+
+
+def test_equal_keys_of_different_types_are_different_models():
+    app = PositionApp(backend='pil')
+    app.pos = {1}
+    before = app._model_snapshot()
+    app.pos = {True}
+    assert app._model_snapshot() != before
+    app.pos = {1: 'a'}
+    before = app._model_snapshot()
+    app.pos = {True: 'a'}
+    assert app._model_snapshot() != before
+
+
+def test_skipping_can_be_turned_off():
+    app = PositionApp(backend='pil', skip_unchanged_redraws=False)
+    press(app, 'Right')
+    assert frames(app) == 2
+
+
+def test_in_place_change_in_redraw_all_is_an_mvc_violation(capsys):
+    class ViolatingApp(PositionApp):
+        def redraw_all(app, canvas):
+            app.pos[0] -= 1
+    app = ViolatingApp(backend='pil')
+    assert not app._running
+    assert 'MVC Violation' in capsys.readouterr().out
+
+
+def test_changing_a_class_in_redraw_all_is_an_mvc_violation(capsys):
+    class Settings:
+        color = 'red'
+    class ViolatingApp(PositionApp):
+        def app_started(app):
+            super().app_started()
+            app.settings = Settings
+        def redraw_all(app, canvas):
+            Settings.color = 'blue' if Settings.color == 'red' else 'red'
+    app = ViolatingApp(backend='pil')
+    assert not app._running
+    assert 'MVC Violation' in capsys.readouterr().out
+
+
+def test_reference_cycles_in_the_model_are_fine():
+    class Node:
+        pass
+    class CycleApp(PositionApp):
+        def app_started(app):
+            super().app_started()
+            app.node = Node()
+            app.node.next = app.node
+            app.node.value = 1
+        def key_pressed(app, event):
+            if event.key == 'a':
+                app.node.value += 1
+    app = CycleApp(backend='pil')
+    assert app._running
+    press(app, 'a')
+    assert frames(app) == 2
+    press(app, 'Right')
+    assert frames(app) == 2
+
+
+def test_snapshots_of_immutable_values_are_kept_until_rebound():
+    class TupleApp(PositionApp):
+        def app_started(app):
+            super().app_started()
+            app.board = tuple((0,) * 10 for _ in range(10))
+        def key_pressed(app, event):
+            if event.key == 'a':
+                app.board = app.board[:9] + ((1,) * 10,)
+    app = TupleApp(backend='pil')
+    first = dict(app._model_snapshot()[0])
+    assert dict(app._model_snapshot()[0])['board'] is first['board']
+    press(app, 'a')
+    assert frames(app) == 2
+    assert dict(app._model_snapshot()[0])['board'] != first['board']
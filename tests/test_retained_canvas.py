@@ -0,0 +1,153 @@
+"""
+Tests for the retained-mode drawing of the event app canvas: items from
+the last frame are reused, replaced and trimmed, and are rebuilt when
+redraw_all changes the canvas directly.
+"""
+import pytest
+
+from uib_inf100_graphics.event_app.uib_inf100_graphics import App
+
+from conftest import requires_display
+
+
+class ScriptedApp(App):
+    # Draws app.frame, a list of (method_name, args, kwargs) calls. A call
+    # to delete without arguments deletes the item drawn just before it
+    def app_started(app):
+        app.frame = []
+
+    def redraw_all(app, canvas):
+        item_id = None
+        for method_name, args, kwargs in app.frame:
+            if (method_name == 'delete') and (not args):
+                canvas.delete(item_id)
+            else:
+                item_id = getattr(canvas, method_name)(*args, **kwargs)
+
+
+def draw_frames(backend, frames):
+    """
+    Draws each frame in turn, and returns the items on the canvas after
+    each of them as a list of (id, type, coords), bottom first.
+    """
+    results = []
+    def run_script(app):
+        for frame in frames:
+            app.frame = frame
+            app._redraw_all_wrapper()
+            canvas = app._canvas
+            results.append([(item_id, canvas.type(item_id),
+                             [float(v) for v in canvas.coords(item_id)])
+                            for item_id in canvas.find_all()])
+        app.quit()
+    if backend == 'pil':
+        run_script(ScriptedApp(backend='pil'))
+    else:
+        class TkScriptedApp(ScriptedApp):
+            def app_started(app):
+                super().app_started()
+                app.timer_delay = 1
+            def timer_fired(app):
+                if not results:
+                    run_script(app)
+        TkScriptedApp(backend='tk')
+    assert len(results) == len(frames), 'the script failed, see the output'
+    return results
+
+
+backends = pytest.mark.parametrize('backend', [
+    'pil',
+    pytest.param('tk', marks=requires_display),
+])
+
+
+def rect(*coords, **options):
+    return ('create_rectangle', coords, options)
+
+def oval(*coords, **options):
+    return ('create_oval', coords, options)
+
+def types(items):
+    # Leaves out the background rectangle drawn before redraw_all
+    return [item_type for _, item_type, _ in items[1:]]
+
+def ids(items):
+    return [item_id for item_id, _, _ in items]
+
+
+@backends
+def test_items_are_reused_and_moved(backend):
+    first, second = draw_frames(backend, [
+        [rect(10, 10, 20, 20, fill='red'), oval(30, 30, 40, 40)],
+        [rect(15, 10, 25, 20, fill='blue'), oval(30, 30, 40, 40)],
+    ])
+    assert ids(first) == ids(second)
+    assert second[1][2] == [15.0, 10.0, 25.0, 20.0]
+    assert types(second) == ['rectangle', 'oval']
+
+
+@backends
+def test_replaced_item_keeps_its_place_in_the_stacking_order(backend):
+    first, second = draw_frames(backend, [
+        [rect(0, 0, 5, 5), rect(10, 10, 20, 20), rect(30, 30, 40, 40)],
+        [rect(0, 0, 5, 5), oval(10, 10, 20, 20), rect(30, 30, 40, 40)],
+    ])
+    assert types(second) == ['rectangle', 'oval', 'rectangle']
+    assert ids(second)[:2] == ids(first)[:2]
+    assert ids(second)[3] == ids(first)[3]
+    assert ids(second)[2] not in ids(first)
+
+
+@backends
+def test_replaced_first_item_stays_above_the_background(backend):
+    first, second = draw_frames(backend, [
+        [rect(0, 0, 5, 5), rect(10, 10, 20, 20)],
+        [oval(0, 0, 5, 5), rect(10, 10, 20, 20)],
+    ])
+    assert ids(second)[0] == ids(first)[0]
+    assert types(second) == ['oval', 'rectangle']
+
+
+@backends
+def test_items_left_over_from_a_longer_frame_are_deleted(backend):
+    first, second, third = draw_frames(backend, [
+        [rect(0, 0, 5, 5), rect(10, 10, 20, 20), rect(30, 30, 40, 40)],
+        [rect(0, 0, 5, 5)],
+        [rect(0, 0, 5, 5), oval(10, 10, 20, 20)],
+    ])
+    assert ids(second) == ids(first)[:2]
+    assert types(third) == ['rectangle', 'oval']
+    assert ids(third)[:2] == ids(first)[:2]
+
+
+@backends
+def test_changed_options_are_updated(backend):
+    results = draw_frames(backend, [
+        [rect(0, 0, 5, 5, fill='red')],
+        [rect(0, 0, 5, 5, fill='blue')],
+        [rect(0, 0, 5, 5, fill='blue', outline='green')],
+    ])
+    assert ids(results[0]) == ids(results[1])
+    assert ids(results[2])[1] != ids(results[1])[1] # new option: new item
+    assert types(results[2]) == ['rectangle']
+
+
+@backends
+def test_direct_delete_in_redraw_all_rebuilds_the_next_frame(backend):
+    frame = [rect(0, 0, 5, 5), oval(10, 10, 20, 20), rect(30, 30, 40, 40)]
+    first, second, third = draw_frames(backend, [
+        frame,
+        frame[:2] + [('delete', (), {})] + frame[2:],
+        frame,
+    ])
+    assert types(second) == ['rectangle', 'rectangle']
+    assert types(third) == ['rectangle', 'oval', 'rectangle']
+
+
+def test_logged_drawing_calls_are_the_calls_of_the_last_frame():
+    app = ScriptedApp(backend='pil')
+    app.frame = [rect(0, 0, 5, 5, fill='red')]
+    app._redraw_all_wrapper()
+    app.frame = [oval(1, 2, 3, 4)]
+    app._redraw_all_wrapper()
+    assert app._canvas.logged_drawing_calls == [('create_oval', (1, 2, 3, 4), {})]
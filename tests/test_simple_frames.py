@@ -0,0 +1,29 @@
+"""
+Tests for the frames kept by a SimplifiedFrame, drawn headless.
+"""
+from PIL import Image
+
+from uib_inf100_graphics.simple.RecordingCanvas import RecordingCanvas
+from uib_inf100_graphics.simple.SimplifiedFrame import SimplifiedFrame
+
+
+def test_kept_frames_do_not_change_with_the_coordinates(tmp_path, capsys):
+    filename = str(tmp_path / 'frames.png')
+    frame = SimplifiedFrame(None)
+    frame.config().set_properties({'RENDERBACKEND': 'pil', 'SAVEMODE': 'last',
+                                   'FILETOSAVE': filename, 'STDDURATION': 0.001})
+    canvas = RecordingCanvas(frame)
+    coords = [0, 0, 10, 10]
+    for x in (0, 20):
+        coords[:] = [x, 0, x + 10, 10]
+        canvas.create_rectangle(coords, fill='red', width=0)
+        frame.display(canvas)
+    coords[:] = [40, 0, 50, 10]
+    assert frame.get_snapshot().getpixel((25, 5)) == (255, 0, 0)
+    frame._save_as_image()
+    with Image.open(filename) as frames:
+        first = frames.convert('RGB')
+        frames.seek(1)
+        second = frames.convert('RGB')
+    assert (first.getpixel((5, 5)), first.getpixel((25, 5))) == ((255, 0, 0), (255, 255, 255))
+    assert (second.getpixel((5, 5)), second.getpixel((25, 5))) == ((255, 255, 255), (255, 0, 0))
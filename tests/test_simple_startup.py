@@ -0,0 +1,82 @@
+"""
+Tests that importing uib_inf100_graphics.simple or .event_app is cheap,
+creates no Tk root and imports no heavy optional dependencies, and that
+the root is created when fonts first need it.
+"""
+import os
+import subprocess
+import sys
+
+import uib_inf100_graphics
+from uib_inf100_graphics.helpers import text_in_box
+from uib_inf100_graphics.simple.RecordingCanvas import RecordingCanvas
+from uib_inf100_graphics.simple.SimplifiedFrame import SimplifiedFrame
+
+from conftest import requires_display
+
+# Generous, so that slow machines pass; creating a Tk root at import, or
+# importing the frame rendering machinery eagerly, used to cost more
+IMPORT_BUDGET_MS = 300
+
+# Only imported when first used (by drawing images, or saving frames)
+HEAVY_MODULES = ['PIL.Image', 'PIL.ImageTk', 'PIL.ImageDraw', 'PIL.ImageFont', 'requests',
+                 'pyscreenshot', 'concurrent.futures']
+
+
+def _cold_import_ms(module: str) -> tuple[float, str, list[str]]:
+    """
+    Imports module in a fresh interpreter with -X importtime, and returns
+    the time spent importing the uib_inf100_graphics package and its
+    modules, the Tk default root after the import (as a string), and the
+    heavy modules which were imported.
+    """
+    code = (f'import sys, tkinter, {module}; print(tkinter._default_root, '
+            + f'*[m for m in {HEAVY_MODULES!r} if m in sys.modules])')
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    src = os.path.dirname(os.path.dirname(uib_inf100_graphics.__file__))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [src, env.get('PYTHONPATH')]))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env, check=True)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split('|')
+        # Only top level imports, as the cumulative time includes nested ones
+        if name.startswith(' uib_inf100_graphics') and cumulative.strip().isdigit():
+            total_us += int(cumulative)
+    default_root, *heavy = result.stdout.split()
+    return total_us / 1000, default_root, heavy
+
+
+def test_import_simple_is_fast_and_creates_no_tk_root():
+    _cold_import_ms('uib_inf100_graphics.simple') # Writes the bytecode
+    elapsed_ms, default_root, heavy = _cold_import_ms('uib_inf100_graphics.simple')
+    assert default_root == 'None'
+    # (PIL.Image comes with uib_inf100_graphics.helpers, which works on images)
+    assert 'PIL.ImageTk' not in heavy
+    assert 0 < elapsed_ms < IMPORT_BUDGET_MS
+
+
+def test_import_event_app_is_fast_and_imports_no_heavy_modules():
+    _cold_import_ms('uib_inf100_graphics.event_app') # Writes the bytecode
+    elapsed_ms, default_root, heavy = _cold_import_ms('uib_inf100_graphics.event_app')
+    assert default_root == 'None'
+    assert heavy == []
+    assert 0 < elapsed_ms < IMPORT_BUDGET_MS
+
+
+@requires_display
+def test_text_in_box_before_first_display():
+    frame = SimplifiedFrame(None)
+    canvas = RecordingCanvas(frame)
+    try:
+        text_in_box(canvas, 0, 0, 200, 50, 'Hello', font=('Arial', 12))
+        [(method_name, _, kwargs)] = canvas._get_calls()
+        assert method_name == 'create_text'
+        assert kwargs['font'].actual()['size'] > 1
+        assert frame._tkroot is not None
+        assert frame._tkroot.state() == 'withdrawn'
+    finally:
+        if frame._tkroot is not None:
+            frame._tkroot.destroy()
@@ -0,0 +1,195 @@
+"""
+Tests for finding the font size with which text fits in a box.
+"""
+import gc
+import tkinter
+import tkinter.font
+
+from uib_inf100_graphics.helpers import text as text_module
+from uib_inf100_graphics.helpers.text import (
+    _FontPool, _font_pool, _fontsize_fit_width, _get_wrapped_layout, _wrap_lines,
+    text_in_box, text_in_boxes,
+)
+
+from conftest import requires_display
+
+
+class WiderThanGlyphsFont:
+    # Each glyph is half the font size wide, but the text as a whole is
+    # drawn wider (as with kerning or fractional glyph widths)
+    def measure(self, size: int, text: str) -> int:
+        return size * len(text) // 2
+
+    def text_width(self, size: int, text: str) -> int:
+        return self.measure(size, text) + size // 4
+
+
+class FakeFont(tkinter.font.Font):
+    # A font which needs no Tk: glyphs are half the size wide, a whole text
+    # of more than one glyph is drawn extra pixels wider than its glyphs,
+    # and lines are two pixels higher than the size. Use a family of its
+    # own for each extra, as metrics are cached by family
+    def __init__(self, root=None, family='Fake', size=10, weight='normal',
+                 slant='roman', underline=0, overstrike=0, extra=0):
+        self.name = f'fake{id(self)}'
+        self.delete_font = False
+        self._tk = None
+        self.extra = extra
+        self.options = {'family': family, 'size': size, 'weight': weight,
+                        'slant': slant, 'underline': underline,
+                        'overstrike': overstrike}
+
+    def actual(self, option=None, displayof=None):
+        return dict(self.options) if option is None else self.options[option]
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def copy(self):
+        return FakeFont(extra=self.extra, **self.options)
+
+    def metrics(self, *options, **kwargs):
+        return self.options['size'] + 2
+
+    def measure(self, text, displayof=None):
+        glyphs = sum(self.options['size'] // 2 for _ in text)
+        return glyphs + (self.extra if len(text) > 1 else 0)
+
+
+def test_fit_width_checks_the_width_of_the_whole_text():
+    font = WiderThanGlyphsFont()
+    for max_width in range(20, 400, 7):
+        size = _fontsize_fit_width(max_width, font, 'Hello', 1)
+        assert font.text_width(size, 'Hello') <= max_width
+        assert font.text_width(size + 1, 'Hello') > max_width
+
+
+@requires_display
+def test_font_pool_takes_list_specs_and_keeps_fonts_to_their_root():
+    root = tkinter.Tk()
+    try:
+        font = _font_pool.get(['Courier', 12])
+        assert _font_pool.get(('Courier', 12)) is font
+        assert _font_pool.sized(font, 20)._tk is root.tk
+    finally:
+        root.destroy()
+    root = tkinter.Tk()
+    try:
+        font = _font_pool.get(['Courier', 12])
+        assert font._tk is root.tk
+        assert _font_pool.sized(font, 20)._tk is root.tk
+    finally:
+        root.destroy()
+
+
+class FontDeletingTk:
+    # Stands in for a Tcl interpreter, and records the fonts deleted in it
+    def __init__(self):
+        self.deleted: list[str] = []
+
+    def call(self, *args):
+        if args[:2] == ('font', 'delete'):
+            self.deleted.append(args[2])
+
+
+class DeletableFont(FakeFont):
+    # A FakeFont which is deleted in its interpreter when garbage collected
+    def __init__(self, root=None, **options):
+        super().__init__(**options)
+        self._tk = root
+        self._call = root.call
+        self.delete_font = True
+
+
+def test_evicted_font_is_only_deleted_when_no_longer_used(monkeypatch):
+    monkeypatch.setattr(text_module, 'Font', DeletableFont)
+    tk = FontDeletingTk()
+    pool = _FontPool(max_fonts=2)
+    font = DeletableFont(tk, family='FakeEvicted')
+    # As used by a recorded frame which is not drawn yet
+    frame_font = pool.sized(font, 10)
+    pool.sized(font, 11)
+    pool.sized(font, 12)
+    assert pool.stats()['evictions'] == 1
+    assert tk.deleted == []
+    assert pool.sized(font, 10) is not frame_font
+    name = frame_font.name
+    assert name not in tk.deleted
+    del frame_font
+    gc.collect()
+    assert name in tk.deleted
+
+
+def test_wrap_lines_puts_as_many_words_as_fit_on_each_line():
+    font = WiderThanGlyphsFont()
+    font.word_width = font.measure
+    # At size 2, every glyph (also the space) is 1 pixel wide
+    lines, fits = _wrap_lines('aa bb cc\ndd ee', font, 2, 5)
+    assert (lines, fits) == (['aa bb', 'cc', 'dd ee'], True)
+    lines, fits = _wrap_lines('aa bbbbbb cc', font, 2, 5)
+    assert (lines, fits) == (['aa', 'bbbbbb', 'cc'], False)
+
+
+def _fits_wrapped(text: str, size: int, max_width: float, max_height: float,
+                  extra: int) -> bool:
+    # Whether text, broken greedily into lines, fits at size in FakeFont
+    lines: list[list[str]] = []
+    for word in text.split():
+        if lines and len(' '.join(lines[-1] + [word])) * (size // 2) <= max_width:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    widths = [len(' '.join(line)) * (size // 2) + extra for line in lines]
+    return max(widths) <= max_width and len(lines) * (size + 2) <= max_height
+
+
+def test_wrapped_text_gets_the_largest_size_which_fits():
+    text = 'the quick brown fox jumps over the lazy dog'
+    for extra, family in [(0, 'FakeWrap'), (3, 'FakeWrapKerned')]:
+        font = FakeFont(family=family, extra=extra)
+        for max_width, max_height in [(100, 40), (200, 100), (60, 300), (400, 20)]:
+            size, wrapped = _get_wrapped_layout(text, font, max_width, max_height, 1)
+            lines = wrapped.split('\n')
+            assert ' '.join(lines) == text
+            assert len(lines) * (size + 2) <= max_height
+            font.configure(size=size)
+            assert max(font.measure(line) for line in lines) <= max_width
+            assert _fits_wrapped(text, size, max_width, max_height, extra)
+            assert not _fits_wrapped(text, size + 1, max_width, max_height, extra)
+
+
+class TextCanvas:
+    # Records the font size of each text drawn
+    def __init__(self):
+        self.sizes: list[int] = []
+
+    def create_text(self, x, y, text, font, **kwargs):
+        self.sizes.append(font.actual('size'))
+        return len(self.sizes)
+
+
+def test_text_in_boxes_solves_each_group_once_and_can_share_one_size(monkeypatch):
+    # Fonts for drawing are created like the font given, so they need no Tk
+    monkeypatch.setattr(text_module, 'Font', FakeFont)
+    font = FakeFont(family='FakeBoxes')
+    boxes = [(0, 0, 100, 30), (100, 0, 200, 30), (0, 30, 100, 60), (0, 60, 300, 120)]
+    texts = ['abc', 'xyz', 'abc', 'abc']
+    alone = TextCanvas()
+    for (x1, y1, x2, y2), text in zip(boxes, texts):
+        text_in_box(alone, x1, y1, x2, y2, text, font=font)
+
+    solved = []
+    get_text_layout = text_module._get_text_layout
+    def counting_get_text_layout(*args):
+        solved.append(args)
+        return get_text_layout(*args)
+    monkeypatch.setattr(text_module, '_get_text_layout', counting_get_text_layout)
+    grid = TextCanvas()
+    text_in_boxes(grid, boxes, texts, font=font)
+    assert grid.sizes == alone.sizes
+    assert len(solved) == 3 # the first and third boxes are the same group
+    assert alone.sizes[3] > alone.sizes[0]
+
+    common = TextCanvas()
+    text_in_boxes(common, boxes, texts, font=font, common_size=True)
+    assert common.sizes == [min(alone.sizes)] * len(boxes)